@@ -0,0 +1,316 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import logging
+import platform
+import statistics
+import subprocess
+import tempfile
+from datetime import datetime, timezone
+
+sys.path.append(os.path.abspath(os.path.join("..")))
+from src import *
+import processor
+
+# Define directory paths
+SCRIPT_DIR = os.getcwd()
+PARENT_DIR = os.path.dirname(SCRIPT_DIR)
+DATA_FOLDER_PATH = os.path.join(PARENT_DIR, "data")
+PDF_FOLDER_PATH = os.path.join(DATA_FOLDER_PATH, "pdf")
+CSV_FOLDER_PATH = os.path.join(DATA_FOLDER_PATH, "csv")
+BENCHMARK_FOLDER_PATH = os.path.join(DATA_FOLDER_PATH, "benchmark")
+FIXTURE_FOLDER_PATH = os.path.join(BENCHMARK_FOLDER_PATH, "fixtures")
+RESULTS_FOLDER_PATH = os.path.join(BENCHMARK_FOLDER_PATH, "results")
+
+# Page ranges cut from the PDF files as fixtures, one per parser layout. The fixtures keep the year and the name
+# of their PDF file, so they are dispatched to the same parser.
+FIXTURES = {
+    "2013-platform-abstracts-fixture": ("2013-platform-abstracts.pdf", range(10, 30)),
+    "2016-plenary_platform_abstracts-fixture": (
+        "2016-plenary_platform_abstracts.pdf",
+        range(10, 30),
+    ),
+    "ASHG-2019-platform-plenary-abstracts-fixture": (
+        "ASHG-2019-platform-plenary-abstracts.pdf",
+        range(20, 60),
+    ),
+    "ASHG2022-PlatformAbstracts-fixture": (
+        "ASHG2022-PlatformAbstracts.pdf",
+        range(20, 60),
+    ),
+    "ASHG2023-PlatformAbstracts-fixture": (
+        "ASHG2023-PlatformAbstracts.pdf",
+        range(20, 60),
+    ),
+}
+
+# Line-rebuilding helpers timed on every page of the fixtures, as functions of a page
+HELPERS = {
+    "get_text_blocks": get_text_blocks,
+    "get_lines_from_column": lambda page: get_lines_from_column(
+        get_text_blocks(page)["blocks"]
+    ),
+    "get_page_lines": get_page_lines,
+    "get_lines_from_page": get_lines_from_page,
+}
+
+
+def build_fixture(name, source, pages):
+    """
+    Cut a range of pages from a PDF file into a fixture PDF file, unless the fixture is newer than its source.
+    Return the path to the fixture.
+    """
+
+    import fitz
+
+    source_path = os.path.join(PDF_FOLDER_PATH, source)
+    fixture_path = os.path.join(FIXTURE_FOLDER_PATH, f"{name}.pdf")
+    if not is_up_to_date(fixture_path, source_path):
+        with fitz.open(source_path) as document, fitz.open() as fixture:
+            fixture.insert_pdf(document, from_page=pages.start, to_page=pages.stop - 1)
+            fixture.save(fixture_path)
+        logging.info(
+            f"Cut pages {pages.start}-{pages.stop - 1} of {source} into {fixture_path}"
+        )
+    return fixture_path
+
+
+def measure(func, repeat):
+    """
+    Call a function repeat times and return the summary of its wall-clock times in seconds.
+    """
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return dict(min=min(times), median=statistics.median(times), max=max(times))
+
+
+def parse_fixture(document, filename):
+    """
+    Parse every work unit of a fixture with the parser registered for its year and return the DataFrames.
+    """
+
+    frames = []
+    for unit in plan_work_units(filename):
+        spec = get_parser_spec(unit.year, unit.poster)
+        pages = get_unit_pages(document, unit)
+        df = records_to_frame(
+            iter_records(
+                document, pages, spec.read_page, spec.parse_page, spec.new_state()
+            )
+        )
+        frames.append(finish_frame(df, spec, unit.year))
+    return frames
+
+
+def time_pages(document, filename):
+    """
+    Time the parsing of each page of a fixture separately, carrying the parsing state across pages.
+    Return the times in seconds.
+    """
+
+    times = []
+    for unit in plan_work_units(filename):
+        spec = get_parser_spec(unit.year, unit.poster)
+        state = spec.new_state()
+        for page_num in get_unit_pages(document, unit):
+            start = time.perf_counter()
+            spec.parse_page(state, spec.read_page(document[page_num]))
+            times.append(time.perf_counter() - start)
+    return times
+
+
+def benchmark_parsers(fixtures, layout_dir, repeat):
+    """
+    Time each parser on its fixture, per file and per page. The layout stores of the fixtures are extracted before
+    timing, as they are reused until the PDF files change.
+    """
+
+    results = {}
+    for name, fixture_path in fixtures.items():
+        filename = os.path.basename(fixture_path)
+        document = open_layout(fixture_path, layout_dir)
+        n_pages = len(document)
+        file_times = measure(lambda: parse_fixture(document, filename), repeat)
+        page_times = time_pages(document, filename)
+        results[f"parser/{name}"] = dict(
+            pages=n_pages,
+            file=file_times,
+            per_page=file_times["median"] / n_pages,
+            page=dict(
+                median=statistics.median(page_times),
+                max=max(page_times),
+            ),
+        )
+        logging.info(
+            f"Parsed {filename} in {file_times['median'] * 1000:.1f} ms "
+            f"({file_times['median'] / n_pages * 1000:.2f} ms/page)"
+        )
+    return results
+
+
+def benchmark_helpers(fixtures, layout_dir, repeat):
+    """
+    Time the line-rebuilding helpers on every page of the fixtures, per page.
+    """
+
+    documents = [open_layout(path, layout_dir) for path in fixtures.values()]
+    pages = [page for document in documents for page in document]
+    results = {}
+    for name, helper in HELPERS.items():
+        times = measure(lambda: [helper(page) for page in pages], repeat)
+        results[f"utils/{name}"] = dict(
+            pages=len(pages), file=times, per_page=times["median"] / len(pages)
+        )
+        logging.info(f"Ran {name} in {times['median'] / len(pages) * 1000:.3f} ms/page")
+    return results
+
+
+def benchmark_aggregation(repeat):
+    """
+    Time the aggregation of the CSV files into the combined datasets on a copy of the CSV folder, from scratch and
+    when no CSV file changed.
+    """
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        # Point the processor to the copy, so the datasets of the repository are left untouched
+        processor.DATA_FOLDER_PATH = work_dir
+        processor.CSV_FOLDER_PATH = os.path.join(work_dir, "csv")
+        processor.AGGREGATE_FOLDER_PATH = os.path.join(work_dir, "aggregate")
+        processor.PARQUET_FOLDER_PATH = os.path.join(work_dir, "parquet")
+        shutil.copytree(CSV_FOLDER_PATH, processor.CSV_FOLDER_PATH)
+
+        def aggregate_from_scratch():
+            shutil.rmtree(processor.AGGREGATE_FOLDER_PATH, ignore_errors=True)
+            processor.aggregate_csv_files()
+
+        # Convert the CSV files to Parquet before timing, as this is done once per CSV file
+        processor.aggregate_csv_files()
+        results = {
+            "aggregate/from_scratch": dict(
+                file=measure(aggregate_from_scratch, repeat)
+            ),
+            "aggregate/unchanged": dict(
+                file=measure(processor.aggregate_csv_files, repeat)
+            ),
+        }
+    for name, result in results.items():
+        logging.info(f"Ran {name} in {result['file']['median'] * 1000:.1f} ms")
+    return results
+
+
+def get_commit():
+    """
+    Return the hash of the checked out commit and whether the working tree has changes, or None if git is not
+    available.
+    """
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, bool(status.strip())
+
+
+def compare_results(results, baseline_path):
+    """
+    Log the ratio of the median time of each benchmark to the median time of a previous run.
+    """
+
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["benchmarks"]
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result["file"]["median"] / baseline[name]["file"]["median"]
+        logging.info(f"{name}: {ratio:.2f}x the time of {baseline_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time the parsers, the line-rebuilding helpers and the aggregation step on fixtures cut "
+        "from the ASHG abstract PDFs, and save the results as JSON."
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Number of times each benchmark is run (default: 5).",
+    )
+    parser.add_argument(
+        "--only",
+        choices=["parsers", "utils", "aggregate"],
+        nargs="+",
+        default=["parsers", "utils", "aggregate"],
+        help="Groups of benchmarks to run (default: all).",
+    )
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="Path of the JSON results (default: a file named after the time and commit in the results folder).",
+    )
+    parser.add_argument(
+        "--compare",
+        default=None,
+        help="Path of the JSON results of a previous run to compare the median times with.",
+    )
+    args = parser.parse_args()
+
+    ensure_folder_exists(FIXTURE_FOLDER_PATH)
+    ensure_folder_exists(RESULTS_FOLDER_PATH)
+    fixtures = {
+        name: build_fixture(name, source, pages)
+        for name, (source, pages) in FIXTURES.items()
+    }
+    layout_dir = os.path.join(FIXTURE_FOLDER_PATH, "layout")
+
+    results = {}
+    if "parsers" in args.only:
+        results.update(benchmark_parsers(fixtures, layout_dir, args.repeat))
+    if "utils" in args.only:
+        results.update(benchmark_helpers(fixtures, layout_dir, args.repeat))
+    if "aggregate" in args.only:
+        results.update(benchmark_aggregation(args.repeat))
+
+    commit, dirty = get_commit()
+    timestamp = datetime.now(timezone.utc)
+    output_path = args.output or os.path.join(
+        RESULTS_FOLDER_PATH,
+        f"{timestamp:%Y%m%dT%H%M%S}-{commit[:10] if commit else 'nogit'}.json",
+    )
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(
+            dict(
+                commit=commit,
+                dirty=dirty,
+                timestamp=timestamp.isoformat(),
+                python=platform.python_version(),
+                platform=platform.platform(),
+                repeat=args.repeat,
+                benchmarks=results,
+            ),
+            f,
+            indent=2,
+        )
+    logging.info(f"Saved benchmark results to {output_path}")
+
+    if args.compare:
+        compare_results(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
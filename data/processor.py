@@ -1,11 +1,14 @@
 import os
+import re
 import sys
+import argparse
 import logging
-import fitz
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 
 sys.path.append(os.path.abspath(os.path.join("..")))
 from src import *
+from src import utils, enums, dicts, registry, layout
 
 # Configure logging
 logging.basicConfig(
@@ -18,79 +21,368 @@ PARENT_DIR = os.path.dirname(SCRIPT_DIR)
 DATA_FOLDER_PATH = os.path.join(PARENT_DIR, "data")
 PDF_FOLDER_PATH = os.path.join(DATA_FOLDER_PATH, "pdf")
 CSV_FOLDER_PATH = os.path.join(DATA_FOLDER_PATH, "csv")
+CACHE_FOLDER_PATH = os.path.join(DATA_FOLDER_PATH, "cache")
+LAYOUT_FOLDER_PATH = os.path.join(DATA_FOLDER_PATH, "layout")
+CHECKPOINT_FOLDER_PATH = os.path.join(DATA_FOLDER_PATH, "checkpoint")
+MANIFEST_PATH = os.path.join(PDF_FOLDER_PATH, "manifest.json")
+AGGREGATE_FOLDER_PATH = os.path.join(DATA_FOLDER_PATH, "aggregate")
+PARQUET_FOLDER_PATH = os.path.join(DATA_FOLDER_PATH, "parquet")
 
 # Ensure the CSV folder exists
 ensure_folder_exists(CSV_FOLDER_PATH)
 
 
-def process_pdf_file(filename):
+def process_pdf_file(
+    filename,
+    executor=None,
+    shard_pages=None,
+    source_hash=None,
+    checkpoint_pages=50,
+    strict=False,
+):
     """
-    Process a PDF file based on its year and save the resulting DataFrame as CSV.
+    Parse a PDF file based on its year and return the resulting DataFrames with the CSV names they are saved under.
+    The file is parsed one work unit at a time, one per section of its abstract book as planned by plan_work_units.
+    If an executor and a shard size are given, the sections of shardable parsers are parsed as shards in the executor.
+    If the SHA-256 digest of the PDF is given, it is used to check the layout store instead of hashing the PDF again.
     """
 
-    if match := re.search(r"(\d{4})", filename):
-        year = match.group(1)
-        file_path = os.path.join(PDF_FOLDER_PATH, filename)
-        var_name = os.path.splitext(filename)[0]
-        file = fitz.open(file_path)
-        logging.info(f"Processing {filename}")
-
-        if year == "2015":
-            df = parser_13_to_18(file)
-            df.set_index("id", inplace=True)
-            if "poster" in filename.lower():
-                update_df(df, [po2015_1885W, po2015_3108T, po2015_3034T, po2015_3070T])
-            else:
-                update_df(df, [pl2015_168])
-
-        elif year == "2019":
-            df = parser_19(file)
-            if "poster" in filename.lower():
-                df["header"] = df["id"].apply(
-                    lambda id: next(
+    units = plan_work_units(filename)
+    if not units:
+        logging.info(f"Skipping {filename} (No year found)")
+        return []
+    return [
+        process_work_unit(
+            unit, executor, shard_pages, source_hash, checkpoint_pages, strict
+        )
+        for unit in units
+    ]
+
+
+def process_work_unit(
+    unit,
+    executor=None,
+    shard_pages=None,
+    source_hash=None,
+    checkpoint_pages=50,
+    strict=False,
+):
+    """
+    Parse a section of a PDF file with the parser registered for its year and return the resulting DataFrame with
+    the CSV name it is saved under. Each call opens its own document, so it can run in a separate worker process.
+    The layout of the PDF is read from its layout store, which is extracted on first use and reused until the PDF changes.
+    Only the abstract pages of the section are parsed, as classified by a pre-pass over the text of the pages.
+    The progress of the parser is checkpointed every checkpoint_pages pages (unless 0), so a rerun after a crash
+    resumes from the last checkpoint. Pages whose parsing raises an error are logged and skipped, and listed in
+    the 'quarantined_pages' attribute of the DataFrame, unless strict is set.
+    """
+
+    spec = get_parser_spec(unit.year, unit.poster)
+    file_path = os.path.join(PDF_FOLDER_PATH, unit.filename)
+    file = open_layout(file_path, LAYOUT_FOLDER_PATH, source_hash)
+    logging.info(f"Processing {unit.filename} ({unit.name})")
+    pages = get_unit_pages(file, unit)
+    quarantined = []
+
+    def quarantine(page_num, error):
+        logging.warning(
+            f"Quarantined page {page_num} of {unit.filename} ({unit.name}): {error!r}",
+            exc_info=error,
+        )
+        quarantined.append(page_num)
+
+    on_error = None if strict else quarantine
+
+    if executor is not None and is_sharded(unit, shard_pages):
+        df, shard_quarantined = parse_sharded(
+            executor,
+            file_path,
+            pages,
+            spec.read_page,
+            spec.parse_page,
+            shard_pages,
+            source_hash,
+            on_error,
+        )
+        quarantined.extend(shard_quarantined)
+    else:
+        checkpoint = None
+        if checkpoint_pages:
+            key = get_parse_cache_key(
+                unit.filename, source_hash or hash_file(file_path)
+            )
+            # The pages quarantined before a crash are restored with the checkpoint
+            checkpoint = PageCheckpoint(
+                os.path.join(CHECKPOINT_FOLDER_PATH, unit.name),
+                key,
+                checkpoint_pages,
+                quarantined,
+            )
+        df = records_to_frame(
+            iter_records(
+                file,
+                pages,
+                spec.read_page,
+                spec.parse_page,
+                spec.new_state(),
+                on_error,
+                checkpoint,
+            )
+        )
+    df = finish_frame(df, spec, unit.year)
+    df.attrs["quarantined_pages"] = sorted(quarantined)
+    return unit.name, df
+
+
+def parse_shard_file(
+    file_path, pages, read_page, parse_page, source_hash=None, strict=False
+):
+    """
+    Parse a page-range shard of a PDF file in a worker process. Pages whose parsing raises an error are logged and
+    skipped unless strict is set.
+    """
+
+    def quarantine(page_num, error):
+        logging.warning(
+            f"Quarantined page {page_num} of {os.path.basename(file_path)}: {error!r}",
+            exc_info=error,
+        )
+
+    return parse_shard(
+        open_layout(file_path, LAYOUT_FOLDER_PATH, source_hash),
+        pages,
+        read_page,
+        parse_page,
+        None if strict else quarantine,
+    )
+
+
+def parse_sharded(
+    executor,
+    file_path,
+    pages,
+    read_page,
+    parse_page,
+    shard_pages,
+    source_hash=None,
+    on_error=None,
+):
+    """
+    Parse a range of pages of a PDF file as shards in worker processes and stitch the results into a DataFrame.
+    Pages failing to parse in a shard are skipped and left out of the replay when the shards are stitched, and
+    pages failing when replayed are passed to on_error, unless on_error is None, in which case errors are raised.
+    Return the DataFrame with the pages quarantined by the shards.
+    """
+
+    futures = [
+        executor.submit(
+            parse_shard_file,
+            file_path,
+            shard,
+            read_page,
+            parse_page,
+            source_hash,
+            on_error is None,
+        )
+        for shard in split_pages(pages, shard_pages)
+    ]
+    shards = [future.result() for future in futures]
+    state = stitch_shards(shards, parse_page, on_error)
+    quarantined = [page_num for shard in shards for page_num in shard["quarantined"]]
+    return records_to_frame(map(finalize_record, state["data"])), quarantined
+
+
+def is_sharded(unit, shard_pages):
+    """
+    Check whether a work unit is parsed as page-range shards.
+    """
+
+    return bool(shard_pages) and get_parser_spec(unit.year, unit.poster).shardable
+
+
+def extract_layout(filename, source_hash=None):
+    """
+    Extract the layout store of a PDF file unless it is up to date. Runs in the extraction stage of the pipeline, in
+    its own process, so the next files are extracted while the current one is parsed and written.
+    """
+
+    if plan_work_units(filename):
+        open_layout(
+            os.path.join(PDF_FOLDER_PATH, filename), LAYOUT_FOLDER_PATH, source_hash
+        )
+
+
+def get_parse_cache_key(filename, source_hash):
+    """
+    Return the cache key of the results of a PDF file, built from the SHA-256 digest of the PDF, the source of its
+    parser module and helpers, the text normalization of the layout store, the override dicts, the parser registry
+    and the post-processing in process_work_unit.
+    """
+
+    # Files without a year have no work units and no parser module
+    parser_modules = [
+        sys.modules[get_parser_spec(unit.year, unit.poster).parse_page.__module__]
+        for unit in plan_work_units(filename)[:1]
+    ]
+    return get_cache_key(
+        source_hash,
+        hash_sources(
+            *parser_modules, utils, enums, dicts, registry, layout, process_work_unit
+        ),
+    )
+
+
+def parse_pdf_files(
+    filenames,
+    workers=1,
+    shard_pages=None,
+    source_hashes=None,
+    queue_size=2,
+    checkpoint_pages=50,
+    strict=False,
+):
+    """
+    Parse PDF files, optionally in a pool of worker processes, and yield their outputs in the order of the given filenames
+    regardless of the order in which workers finish.
+    With a single worker, the layout stores of the next files are extracted in a separate process while the current file
+    is parsed. With more workers, the work units of each file are dispatched to the pool on their own, so the sections of
+    a file are parsed in parallel, and each worker extracts the layout store it needs. If a shard size is given, the pages
+    of large sections are parsed as shards across the worker processes.
+    At most queue_size files (plus one per worker) are extracted or parsed ahead of the file being yielded, which bounds
+    the results held in memory.
+    Known SHA-256 digests of the PDF files can be given as a dictionary keyed by filename.
+    The checkpoint interval and strict flag are passed to process_work_unit.
+    """
+
+    source_hashes = source_hashes or {}
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+
+            def submit(filename):
+                units = plan_work_units(filename)
+                if not units:
+                    logging.info(f"Skipping {filename} (No year found)")
+                elif len(units) > 1:
+                    # Extract the layout store before the sections of the file are parsed in separate workers
+                    open_layout(
+                        os.path.join(PDF_FOLDER_PATH, filename),
+                        LAYOUT_FOLDER_PATH,
+                        source_hashes.get(filename),
+                    )
+                # Submit whole work units ahead, sharded units submit their shards when they are reached
+                return [
+                    (
+                        unit,
                         (
-                            topic
-                            for topic, (start, end) in topic_mapping_2019.items()
-                            if start <= int(id) <= end
+                            None
+                            if is_sharded(unit, shard_pages)
+                            else executor.submit(
+                                process_work_unit,
+                                unit,
+                                source_hash=source_hashes.get(filename),
+                                checkpoint_pages=checkpoint_pages,
+                                strict=strict,
+                            )
                         ),
-                        None,
                     )
-                )
-        elif year == "2021":
-            dfs = parser_21(file)
-            save_dfs_to_csv(dfs, year, var_name)
-            return
-
-        elif year == "2022":
-            df = parser_22(file)
-            if "poster" in filename.lower():
-                df.set_index("id", inplace=True)
-                update_df(df, [po2022_1537])
-
-        elif year == "2023":
-            df = (
-                parser_23_poster(file)
-                if "poster" in filename.lower()
-                else parser_23_non_poster(file)
-            )
-
-        else:
-            df = parser_13_to_18(file)
+                    for unit in units
+                ]
 
-        df["year"] = year
-        save_df_to_csv(df, var_name)
+            for filename, unit_futures in prefetch(
+                submit, filenames, queue_size + workers
+            ):
+                yield [
+                    (
+                        future.result()
+                        if future
+                        else process_work_unit(
+                            unit,
+                            executor,
+                            shard_pages,
+                            source_hashes.get(filename),
+                            strict=strict,
+                        )
+                    )
+                    for unit, future in unit_futures
+                ]
     else:
-        logging.info(f"Skipping {filename} (No year found)")
+        with ProcessPoolExecutor(max_workers=1) as extractor:
+            for filename, future in prefetch(
+                lambda filename: extractor.submit(
+                    extract_layout, filename, source_hashes.get(filename)
+                ),
+                filenames,
+                queue_size,
+            ):
+                future.result()
+                yield process_pdf_file(
+                    filename,
+                    source_hash=source_hashes.get(filename),
+                    checkpoint_pages=checkpoint_pages,
+                    strict=strict,
+                )
 
 
-def update_df(df, updates):
+def process_pdf_files(
+    filenames,
+    workers=1,
+    shard_pages=None,
+    cache_dir=None,
+    queue_size=2,
+    checkpoint_pages=50,
+    strict=False,
+):
     """
-    Update the DataFrame with specific rows.
+    Parse PDF files and save the results as CSV files.
+    The files go through a pipeline of stages connected by bounded queues: the layout stores are extracted, the
+    sections are parsed, and the results are written to the cache, the CSV files and the Parquet dataset in a
+    background thread. At most queue_size files wait between two stages, so a fast stage is held back by a slow one
+    instead of piling up results in memory.
+    If a cache folder is given, files whose PDF, parser and overrides are unchanged are served from the cache
+    and only the remaining files are parsed. The digests of PDF files recorded in the download manifest by the
+    sourcer are reused as long as the files are unchanged, so unchanged PDFs are not read again.
+    Sections are checkpointed every checkpoint_pages pages, and pages failing to parse are quarantined unless strict
+    is set. Files with quarantined pages are not cached, so they are parsed again on the next run.
     """
 
-    update_df = pd.DataFrame(updates).set_index("id")
-    df.update(update_df)
-    df.reset_index(inplace=True)
+    manifest = load_manifest(MANIFEST_PATH)
+    source_hashes = {
+        filename: get_file_hash(os.path.join(PDF_FOLDER_PATH, filename), manifest)
+        for filename in filenames
+    }
+
+    def save(item):
+        key, outputs = item
+        if key and not any(df.attrs.get("quarantined_pages") for _, df in outputs):
+            save_to_cache(cache_dir, key, outputs)
+        save_outputs(outputs)
+
+    with WriteBehind(save, queue_size) as writer:
+        keys, pending = {}, []
+        for filename in filenames:
+            if cache_dir:
+                keys[filename] = get_parse_cache_key(filename, source_hashes[filename])
+                outputs = load_from_cache(cache_dir, keys[filename])
+                if outputs is not None:
+                    logging.info(f"Loaded {filename} from cache")
+                    writer.put((None, outputs))
+                    continue
+            pending.append(filename)
+
+        for filename, outputs in zip(
+            pending,
+            parse_pdf_files(
+                pending,
+                workers,
+                shard_pages,
+                source_hashes,
+                queue_size,
+                checkpoint_pages,
+                strict,
+            ),
+        ):
+            writer.put((keys.get(filename), outputs))
 
 
 def save_df_to_csv(df, var_name):
@@ -103,65 +395,204 @@ def save_df_to_csv(df, var_name):
     logging.info(f"Saved DataFrame to {csv_path}")
 
 
-def save_dfs_to_csv(dfs, year, var_name):
+def save_outputs(outputs):
     """
-    Save multiple DataFrames as separate CSV files.
+    Save (CSV name, DataFrame) pairs as CSV files and, if pyarrow is installed, to the partition of their year
+    in the Parquet dataset.
     """
 
-    suffixes = ["Plenary", "Platform", "Talks", "Presentations"]
-    for df, suffix in zip(dfs, suffixes):
+    for var_name, df in outputs:
+        save_df_to_csv(df, var_name)
+        if PARQUET_AVAILABLE:
+            year = re.search(r"(\d{4})", var_name).group(1)
+            parquet_path = save_df_to_parquet(df, PARQUET_FOLDER_PATH, var_name, year)
+            logging.info(f"Saved DataFrame to {parquet_path}")
+
+
+def load_abstracts(csv_path):
+    """
+    Read a CSV file and select the columns of the combined datasets.
+    If pyarrow is installed, only these columns are read from the Parquet file of the CSV file in the Parquet dataset.
+    CSV files without an up-to-date Parquet file, e.g. ones edited by hand, are converted first.
+    """
+
+    var_name = os.path.splitext(os.path.basename(csv_path))[0]
+    match = re.search(r"(\d{4})", var_name)
+    if PARQUET_AVAILABLE and match:
+        year = match.group(1)
+        parquet_path = get_parquet_path(PARQUET_FOLDER_PATH, year, var_name)
+        if not is_up_to_date(parquet_path, csv_path):
+            df = pd.read_csv(csv_path, encoding="utf-8", dtype=str)
+            save_df_to_parquet(df, PARQUET_FOLDER_PATH, var_name, year)
+            logging.info(f"Converted {csv_path} to {parquet_path}")
+        df = read_parquet_file(parquet_path, columns=["title", "content", "header"])
         df["year"] = year
-        csv_path = os.path.join(CSV_FOLDER_PATH, f"{var_name}-{suffix}.csv")
-        df.to_csv(csv_path, index=False, escapechar="\\")
-        logging.info(f"Saved DataFrame to {csv_path}")
+    else:
+        df = pd.read_csv(csv_path, encoding="utf-8")
+    # Select specific columns from the DataFrame
+    try:
+        truncated_df = df[["title", "content", "header", "year"]].copy()
+    except KeyError:
+        truncated_df = df[["title", "content", "year"]].copy()
+        truncated_df.loc[:, "header"] = "None"
+    # Keep the same column order for every file, as partitions are combined without realigning columns
+    return truncated_df[["title", "content", "header", "year"]]
 
 
-# Process all PDF files in the folder
-for filename in os.listdir(PDF_FOLDER_PATH):
-    if filename.endswith("pdf"):
-        process_pdf_file(filename)
+# Number of headers missing from recat_dict named in the warning, the full list is logged at DEBUG level
+REPORTED_HEADERS = 5
 
-# List to store DataFrames from all CSV files
-all_dfs = []
 
-# Iterate over all files in the CSV folder
-for filename in os.listdir(CSV_FOLDER_PATH):
-    if filename != ".DS_Store":
-        # Construct full path to the CSV file
-        csv_path = os.path.join(CSV_FOLDER_PATH, filename)
-        df = pd.read_csv(csv_path, encoding="utf-8")
-        # Select specific columns from the DataFrame
-        try:
-            truncated_df = df[["title", "content", "header", "year"]].copy()
-        except KeyError:
-            truncated_df = df[["title", "content", "year"]].copy()
-            truncated_df.loc[:, "header"] = "None"
-        # Append the truncated DataFrame to the list
-        all_dfs.append(truncated_df)
-
-# Concatenate all DataFrames into a single DataFrame
-complete_df = pd.concat(all_dfs, ignore_index=True)
-
-# Replace header values according to the recat_dict dictionary
-complete_df["header"] = complete_df["header"].apply(lambda x: recat_dict.get(x, "None"))
-
-# Save the complete DataFrame to a CSV file
-complete_df.to_csv(
-    os.path.join(DATA_FOLDER_PATH, "complete_data.csv"), index=False, escapechar="\\"
-)
+def recategorize_headers(headers):
+    """
+    Map raw headers to their categories in recat_dict as a categorical column. The mapping is computed once per distinct
+    header instead of once per row. Headers missing from recat_dict are set to 'None' and reported, so that the session
+    names of a new year are noticed and added to recat_dict.
+    """
 
-# Filter and save labeled data (where header is not 'To split', 'COVID-19', or 'None')
-labeled_data = complete_df[
-    ~complete_df["header"].isin(["To split", "COVID-19", "None"])
-]
-labeled_data.to_csv(
-    os.path.join(DATA_FOLDER_PATH, "labeled_data.csv"), index=False, escapechar="\\"
-)
+    headers = headers.astype("category")
+    raw_categories = headers.cat.categories
+    categories = pd.Index([recat_dict.get(header, "None") for header in raw_categories])
 
-# Filter and save unlabeled data (where header is 'To split', 'COVID-19', or 'None')
-unlabeled_data = complete_df[
-    complete_df["header"].isin(["To split", "COVID-19", "None"])
-]
-unlabeled_data.to_csv(
-    os.path.join(DATA_FOLDER_PATH, "unlabeled_data.csv"), index=False, escapechar="\\"
-)
+    # Report the headers that fall through, other than the placeholder of files without headers
+    unmapped = [
+        header
+        for header in raw_categories
+        if header not in recat_dict and header != "None"
+    ]
+    if unmapped:
+        counts = headers.value_counts()[unmapped].sort_values(ascending=False)
+        logging.warning(
+            f"Headers missing from recat_dict are set to 'None' for {counts.sum()} abstracts, "
+            f"{len(counts)} distinct, e.g. {list(counts.index[:REPORTED_HEADERS])}"
+        )
+        logging.debug(f"Headers missing from recat_dict: {counts.to_dict()}")
+
+    # Missing headers have the code -1 and take the last, 'None' entry
+    codes = headers.cat.codes.to_numpy()
+    values = categories.append(pd.Index(["None"]))[codes]
+    return pd.Series(pd.Categorical(values), index=headers.index)
+
+
+def split_abstracts(df):
+    """
+    Recategorize the headers of abstracts and split them into the complete, labeled and unlabeled datasets.
+    """
+
+    df["header"] = recategorize_headers(df["header"])
+
+    # Labeled data has a header other than 'To split', 'COVID-19', or 'None'
+    unlabeled = df["header"].isin(["To split", "COVID-19", "None"]).to_numpy()
+    return dict(
+        complete_data=df, labeled_data=df[~unlabeled], unlabeled_data=df[unlabeled]
+    )
+
+
+def aggregate_csv_files():
+    """
+    Combine all CSV files into the complete, labeled and unlabeled datasets.
+    The datasets are kept partitioned by year in the aggregate folder, where only the years whose CSV files were
+    added, changed or removed since the last run are rebuilt. The combined datasets are then reassembled from the
+    partitions, rewriting them only from the first partition that changed.
+    """
+
+    filenames = sorted(
+        filename for filename in os.listdir(CSV_FOLDER_PATH) if filename != ".DS_Store"
+    )
+    state = update_partitions(
+        CSV_FOLDER_PATH,
+        filenames,
+        AGGREGATE_FOLDER_PATH,
+        load_abstracts,
+        split_abstracts,
+        hash_sources(load_abstracts, recategorize_headers, split_abstracts, dicts),
+    )
+    for name in ["complete_data", "labeled_data", "unlabeled_data"]:
+        combine_partitions(
+            AGGREGATE_FOLDER_PATH,
+            state,
+            name,
+            os.path.join(DATA_FOLDER_PATH, f"{name}.csv"),
+        )
+    save_aggregate_state(AGGREGATE_FOLDER_PATH, state)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Parse the ASHG abstract PDFs into CSV files and build the combined datasets."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes used to parse PDF files (default: 1).",
+    )
+    parser.add_argument(
+        "--shard-pages",
+        type=int,
+        default=None,
+        help="Split the PDF files of sharded years into shards of this many pages, "
+        "which are parsed in separate worker processes (requires --workers > 1).",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=2,
+        help="Number of files each stage of the pipeline may run ahead of the next one (default: 2).",
+    )
+    parser.add_argument(
+        "--checkpoint-pages",
+        type=int,
+        default=50,
+        help="Number of pages parsed between two checkpoints of a section, from which a rerun resumes after a "
+        "crash (default: 50, 0 disables checkpoints).",
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="Stop on the first page failing to parse instead of logging and skipping it.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Parse every PDF file without reading or writing the parse cache.",
+    )
+    parser.add_argument(
+        "--cache-max-size",
+        type=float,
+        default=1024,
+        help="Maximum size of the parse cache in MB (default: 1024).",
+    )
+    parser.add_argument(
+        "--cache-max-age",
+        type=float,
+        default=30,
+        help="Maximum age in days of unused parse cache entries (default: 30).",
+    )
+    args = parser.parse_args()
+
+    # Process all PDF files in the folder
+    filenames = sorted(
+        filename for filename in os.listdir(PDF_FOLDER_PATH) if filename.endswith("pdf")
+    )
+    cache_dir = None if args.no_cache else CACHE_FOLDER_PATH
+    process_pdf_files(
+        filenames,
+        workers=args.workers,
+        shard_pages=args.shard_pages,
+        cache_dir=cache_dir,
+        queue_size=args.queue_size,
+        checkpoint_pages=args.checkpoint_pages,
+        strict=args.strict,
+    )
+    if cache_dir:
+        prune_cache(
+            cache_dir,
+            max_size=args.cache_max_size * 1024**2,
+            max_age=args.cache_max_age * 24 * 60 * 60,
+        )
+    aggregate_csv_files()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,23 +2,36 @@ import os
 import sys
 
 sys.path.append(os.path.abspath(os.path.join("..")))
-from src import *
+from src import (
+    ensure_folder_exists,
+    fetch_and_parse_url,
+    create_session,
+    load_manifest,
+    save_manifest,
+    download_files,
+)
 
 # Define constants for paths and URLs
 SOURCER_DIR = os.path.dirname(os.path.abspath(__file__))
 PDF_FOLDER_NAME = "pdf"
 PDF_FOLDER_PATH = os.path.join(SOURCER_DIR, PDF_FOLDER_NAME)
+MANIFEST_PATH = os.path.join(PDF_FOLDER_PATH, "manifest.json")
 URL = "https://www.ashg.org/meetings/future-past/abstract-archive/"
 START_YEAR = 2013
 END_YEAR = 2023
 EXCLUDE_YEAR = 2020
+DOWNLOAD_WORKERS = 4
 
 # Ensure the PDF folder exists
 ensure_folder_exists(PDF_FOLDER_PATH)
 os.chdir(PDF_FOLDER_PATH)
 
+# Share one pooled HTTP session between the archive page and the file downloads
+session = create_session(DOWNLOAD_WORKERS)
+
 # Fetch and parse the abstract archive page
-if soup := fetch_and_parse_url(URL):
+if soup := fetch_and_parse_url(URL, session):
+    links = []
     # Find all <li> elements under the 'entry-content' div
     li_blocks = soup.find("div", "entry-content").find("ul").find_all("li")
     for li in li_blocks:
@@ -28,6 +41,17 @@ if soup := fetch_and_parse_url(URL):
             # Find all <a> elements within the current <li> block
             a_blocks = li.find_all("a")
             for a in a_blocks:
-                # Download the file if 'Interactive Search' is not in the link text
+                # Collect the file if 'Interactive Search' is not in the link text
                 if "Interactive Search" not in a.text:
-                    download_file(a["href"], PDF_FOLDER_PATH)
+                    links.append(a["href"])
+
+    # Download the collected files concurrently, refreshing the ones already downloaded only if they changed
+    manifest = load_manifest(MANIFEST_PATH)
+    download_files(
+        links,
+        PDF_FOLDER_PATH,
+        workers=DOWNLOAD_WORKERS,
+        session=session,
+        manifest=manifest,
+    )
+    save_manifest(MANIFEST_PATH, manifest)
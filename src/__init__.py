@@ -1,4 +1,157 @@
-from .enums import *
-from .utils import *
-from .dicts import *
-from .parsers import *
+import importlib
+from .parsers import __all__ as _parser_names
+
+# Registry of the submodules and the names each of them exports. A submodule is only imported when one of its
+# names is first accessed, so e.g. the sourcer does not load pandas, PyMuPDF or the parsers.
+SUBMODULES = {
+    "enums": ("ParsingStage", "LineKind", "PageKind"),
+    "utils": (
+        "ensure_folder_exists",
+        "fetch_and_parse_url",
+        "assemble_lines",
+        "sort_lines",
+        "get_lines_from_column",
+        "get_page_lines",
+        "get_sorted_page_lines",
+        "get_lines_from_page",
+        "iter_records",
+        "classify_pages",
+        "get_section_pages",
+        "split_pages",
+        "parse_shard",
+        "stitch_shards",
+        "TextBuilder",
+        "get_tail",
+        "finalize_record",
+        "records_to_frame",
+        "IdRangeIndex",
+        "update_data",
+        "compile_line_patterns",
+        "get_line_patterns",
+        "classify_line",
+        "is_id",
+        "is_page_num",
+        "is_marker",
+        "get_text",
+        "is_empty",
+        "skip",
+        "ends_with_dash",
+        "get_fonts_and_texts",
+        "get_last_bold_font_index",
+        "is_title_end",
+        "is_authors_end",
+        "is_content_start_x1",
+        "is_content_start_x2",
+        "is_content_start_y",
+    ),
+    "dicts": (
+        "po2015_1885W",
+        "po2015_3108T",
+        "po2015_3034T",
+        "po2015_3070T",
+        "pl2015_168",
+        "po2022_1537",
+        "topic_mapping_2019",
+        "recat_dict",
+    ),
+    "cache": (
+        "hash_file",
+        "hash_sources",
+        "get_cache_key",
+        "get_cache_path",
+        "load_from_cache",
+        "save_to_cache",
+        "prune_cache",
+    ),
+    "download": (
+        "CHUNK_SIZE",
+        "RETRY_STATUS_CODES",
+        "create_session",
+        "is_retryable",
+        "load_manifest",
+        "save_manifest",
+        "record_file",
+        "get_file_hash",
+        "get_expected_size",
+        "fetch_to_file",
+        "head_if_same_size",
+        "check_local_file",
+        "download_file",
+        "download_files",
+    ),
+    "aggregate": (
+        "AGGREGATE_VERSION",
+        "STATE_FILENAME",
+        "get_partition_dir",
+        "load_aggregate_state",
+        "save_aggregate_state",
+        "find_changed_files",
+        "write_partition",
+        "update_partitions",
+        "combine_partitions",
+    ),
+    "columnar": (
+        "PARQUET_AVAILABLE",
+        "CATEGORICAL_COLUMNS",
+        "get_parquet_path",
+        "save_df_to_parquet",
+        "is_up_to_date",
+        "read_parquet_file",
+        "read_abstracts",
+    ),
+    "registry": (
+        "ParserSpec",
+        "WorkUnit",
+        "resolve_parser_name",
+        "assign_topics_2019",
+        "PARSER_REGISTRY",
+        "DEFAULT_PARSER_SPEC",
+        "get_parser_spec",
+        "plan_work_units",
+        "classify_spec_pages",
+        "get_unit_pages",
+        "apply_overrides",
+        "finish_frame",
+    ),
+    "pipeline": ("prefetch", "WriteBehind"),
+    "checkpoint": ("PageCheckpoint",),
+    "layout": (
+        "LAYOUT_VERSION",
+        "LAYOUT_COLUMNS",
+        "TEXT_TRANSLATION",
+        "Span",
+        "Line",
+        "normalize_text",
+        "merge_split_spans",
+        "build_layout_store",
+        "is_layout_store_valid",
+        "open_layout",
+        "LayoutDocument",
+        "LayoutPage",
+        "get_text_blocks",
+    ),
+    "parsers": tuple(_parser_names),
+}
+
+_MODULE_OF = {
+    name: module_name for module_name, names in SUBMODULES.items() for name in names
+}
+
+__all__ = list(_MODULE_OF)
+
+
+def __getattr__(name):
+    """
+    Imports the submodule exporting a name, or a submodule itself, on first access (PEP 562).
+    """
+    if name in SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    if name not in _MODULE_OF:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_MODULE_OF[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
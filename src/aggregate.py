@@ -0,0 +1,319 @@
+import os
+import json
+import shutil
+import logging
+from .cache import hash_file
+
+# Bump whenever the layout of the partitioned dataset changes, so that existing partitions are rebuilt
+AGGREGATE_VERSION = 1
+
+# Name of the file recording the source files and partitions of a partitioned dataset
+STATE_FILENAME = "state.json"
+
+
+def get_partition_dir(aggregate_dir, year):
+    """
+    Returns the path of the folder holding the partition of a year.
+
+    Parameters:
+    -----------
+    aggregate_dir : str
+        The path to the folder holding the partitioned dataset.
+    year : str
+        The year of the partition.
+
+    Returns:
+    --------
+    str
+        The path to the partition folder.
+    """
+    return os.path.join(aggregate_dir, f"year={year}")
+
+
+def load_aggregate_state(aggregate_dir, fingerprint):
+    """
+    Loads the record of the source files and partitions of a partitioned dataset. The record is discarded,
+    so that every partition is rebuilt, if it was written by a different version or by different code.
+
+    Parameters:
+    -----------
+    aggregate_dir : str
+        The path to the folder holding the partitioned dataset.
+    fingerprint : str
+        A digest of the code and mappings producing the partitions.
+
+    Returns:
+    --------
+    dict
+        A dictionary containing:
+        - files: The size, modification time, SHA-256 digest and years of each source file.
+        - partitions: The output files of each partition, with their size and SHA-256 digest.
+        - combined: The partitions each combined output file was assembled from, in order, with the offset
+          where the rows of each partition end.
+    """
+    empty_state = dict(
+        version=AGGREGATE_VERSION,
+        fingerprint=fingerprint,
+        files={},
+        partitions={},
+        combined={},
+    )
+    try:
+        with open(os.path.join(aggregate_dir, STATE_FILENAME), encoding="utf-8") as f:
+            state = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return empty_state
+    if (state.get("version"), state.get("fingerprint")) != (
+        AGGREGATE_VERSION,
+        fingerprint,
+    ):
+        return empty_state
+    return state
+
+
+def save_aggregate_state(aggregate_dir, state):
+    """
+    Saves the record of the source files and partitions of a partitioned dataset.
+
+    Parameters:
+    -----------
+    aggregate_dir : str
+        The path to the folder holding the partitioned dataset.
+    state : dict
+        The record, as returned by load_aggregate_state.
+
+    Returns:
+    --------
+    None
+    """
+    state_path = os.path.join(aggregate_dir, STATE_FILENAME)
+    with open(f"{state_path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(f"{state_path}.tmp", state_path)
+
+
+def find_changed_files(source_dir, filenames, state, load_frame):
+    """
+    Compares the source files with the ones recorded in the state and loads the ones that are new or changed.
+    A file whose size and modification time are unchanged is not read. A file that was touched but has the
+    same SHA-256 digest is not loaded.
+
+    Parameters:
+    -----------
+    source_dir : str
+        The path to the folder holding the source files.
+    filenames : list of str
+        The names of the source files.
+    state : dict
+        The record of the previous run, whose 'files' are updated in place.
+    load_frame : callable
+        A function loading a source file into a DataFrame with a 'year' column.
+
+    Returns:
+    --------
+    tuple
+        A tuple of the loaded DataFrames keyed by filename and the set of years whose partitions are affected.
+    """
+    previous, frames, changed_years = state["files"], {}, set()
+    state["files"] = {}
+
+    for filename in filenames:
+        file_path = os.path.join(source_dir, filename)
+        stat = os.stat(file_path)
+        entry = previous.get(filename)
+        if entry and (entry["size"], entry["mtime_ns"]) == (
+            stat.st_size,
+            stat.st_mtime_ns,
+        ):
+            state["files"][filename] = entry
+            continue
+
+        sha256 = hash_file(file_path)
+        if entry and entry["sha256"] == sha256:
+            state["files"][filename] = dict(entry, mtime_ns=stat.st_mtime_ns)
+            continue
+
+        frames[filename] = load_frame(file_path)
+        years = sorted(frames[filename]["year"].astype(str).unique())
+        state["files"][filename] = dict(
+            size=stat.st_size, mtime_ns=stat.st_mtime_ns, sha256=sha256, years=years
+        )
+        changed_years.update(years)
+        if entry:
+            changed_years.update(entry["years"])
+
+    # The partitions of removed files are affected as well
+    for filename, entry in previous.items():
+        if filename not in state["files"]:
+            changed_years.update(entry["years"])
+
+    return frames, changed_years
+
+
+def write_partition(partition_dir, outputs):
+    """
+    Writes the output files of a partition, replacing the previous ones.
+
+    Parameters:
+    -----------
+    partition_dir : str
+        The path to the partition folder.
+    outputs : dict
+        A dictionary mapping the name of each output file to its DataFrame.
+
+    Returns:
+    --------
+    dict
+        A dictionary mapping the name of each output file to its size and SHA-256 digest.
+    """
+    os.makedirs(partition_dir, exist_ok=True)
+    files = {}
+    for name, df in outputs.items():
+        file_path = os.path.join(partition_dir, f"{name}.csv")
+        df.to_csv(f"{file_path}.tmp", index=False, escapechar="\\")
+        os.replace(f"{file_path}.tmp", file_path)
+        files[name] = dict(size=os.path.getsize(file_path), sha256=hash_file(file_path))
+    return files
+
+
+def update_partitions(
+    source_dir, filenames, aggregate_dir, load_frame, split_frame, fingerprint
+):
+    """
+    Updates a dataset partitioned by year from a set of source files, rebuilding only the partitions of
+    years whose source files were added, changed or removed since the last run.
+
+    Parameters:
+    -----------
+    source_dir : str
+        The path to the folder holding the source files.
+    filenames : list of str
+        The names of the source files, in the order their rows appear in the dataset.
+    aggregate_dir : str
+        The path to the folder holding the partitioned dataset.
+    load_frame : callable
+        A function loading a source file into a DataFrame with a 'year' column.
+    split_frame : callable
+        A function turning the DataFrame of a partition into a dictionary mapping the name of each output
+        file to its DataFrame.
+    fingerprint : str
+        A digest of the code and mappings producing the partitions. All partitions are rebuilt if it changes.
+
+    Returns:
+    --------
+    dict
+        The updated record of the source files and partitions, as returned by load_aggregate_state, with the
+        years of the partitions in 'order'. It is saved with save_aggregate_state once the combined files
+        are assembled.
+    """
+    os.makedirs(aggregate_dir, exist_ok=True)
+    state = load_aggregate_state(aggregate_dir, fingerprint)
+    frames, changed_years = find_changed_files(source_dir, filenames, state, load_frame)
+
+    # Partitions whose files went missing are rebuilt as well
+    for year, files in state["partitions"].items():
+        partition_dir = get_partition_dir(aggregate_dir, year)
+        if not all(
+            os.path.exists(os.path.join(partition_dir, f"{name}.csv")) for name in files
+        ):
+            changed_years.add(year)
+
+    for year in sorted(changed_years):
+        sources = [
+            filename
+            for filename in filenames
+            if year in state["files"][filename]["years"]
+        ]
+        partition_dir = get_partition_dir(aggregate_dir, year)
+        if not sources:
+            shutil.rmtree(partition_dir, ignore_errors=True)
+            state["partitions"].pop(year, None)
+            logging.info(f"Removed partition {year}")
+            continue
+
+        import pandas as pd
+
+        df = pd.concat(
+            [
+                (
+                    frames[filename]
+                    if filename in frames
+                    else load_frame(os.path.join(source_dir, filename))
+                )
+                for filename in sources
+            ],
+            ignore_index=True,
+        )
+        df = df[df["year"].astype(str) == year].reset_index(drop=True)
+        state["partitions"][year] = write_partition(partition_dir, split_frame(df))
+        logging.info(f"Rebuilt partition {year} from {len(sources)} files")
+
+    # Order the partitions by the first source file contributing to them
+    order = []
+    for filename in filenames:
+        for year in state["files"][filename]["years"]:
+            if year not in order:
+                order.append(year)
+    state["order"] = order
+    return state
+
+
+def combine_partitions(aggregate_dir, state, name, output_path):
+    """
+    Assembles an output file of all partitions into a single CSV file. The combined file is only rewritten
+    from the first partition that changed since it was last assembled, so adding the partition of a new year
+    appends it instead of rewriting the data of every year before it.
+
+    Parameters:
+    -----------
+    aggregate_dir : str
+        The path to the folder holding the partitioned dataset.
+    state : dict
+        The record of the source files and partitions, as returned by update_partitions.
+    name : str
+        The name of the output file within each partition.
+    output_path : str
+        The path to the combined CSV file.
+
+    Returns:
+    --------
+    None
+    """
+    parts = [
+        [year, state["partitions"][year][name]["sha256"]] for year in state["order"]
+    ]
+    previous = state["combined"].get(name, dict(parts=[], size=None))
+
+    # Keep the rows of the unchanged leading partitions if the combined file is the one last assembled
+    keep = 0
+    if os.path.exists(output_path) and os.path.getsize(output_path) == previous["size"]:
+        while (
+            keep < min(len(parts), len(previous["parts"]))
+            and parts[keep] == previous["parts"][keep][:2]
+        ):
+            keep += 1
+    offset = previous["parts"][keep - 1][2] if keep else 0
+
+    with open(output_path, "r+b" if keep else "wb") as output:
+        output.seek(offset)
+        output.truncate()
+        for idx, (year, _) in enumerate(parts):
+            partition_path = os.path.join(
+                get_partition_dir(aggregate_dir, year), f"{name}.csv"
+            )
+            if idx < keep:
+                parts[idx].append(previous["parts"][idx][2])
+                continue
+            with open(partition_path, "rb") as partition:
+                # Only the first partition contributes its header line
+                header = partition.readline()
+                if output.tell() == 0:
+                    output.write(header)
+                shutil.copyfileobj(partition, output)
+            parts[idx].append(output.tell())
+        size = output.tell()
+
+    state["combined"][name] = dict(parts=parts, size=size)
+    logging.info(
+        f"Assembled {output_path} ({len(parts) - keep} of {len(parts)} partitions written)"
+    )
@@ -0,0 +1,187 @@
+import os
+import time
+import pickle
+import hashlib
+import inspect
+import logging
+
+
+def hash_file(file_path, chunk_size=1 << 20):
+    """
+    Computes the SHA-256 digest of the bytes of a file.
+
+    Parameters:
+    -----------
+    file_path : str
+        The path to the file to be hashed.
+    chunk_size : int, optional
+        The number of bytes read at a time.
+
+    Returns:
+    --------
+    str
+        The hexadecimal SHA-256 digest of the file.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_sources(*objects):
+    """
+    Computes a fingerprint of the source code of modules, classes or functions, so that cached results
+    are invalidated whenever the code producing them changes.
+
+    Parameters:
+    -----------
+    *objects : module, class or function
+        The objects whose source code is fingerprinted.
+
+    Returns:
+    --------
+    str
+        The hexadecimal SHA-256 digest of the combined source code.
+    """
+    digest = hashlib.sha256()
+    for obj in objects:
+        digest.update(inspect.getsource(obj).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def get_cache_key(*parts):
+    """
+    Combines digests (e.g. of a PDF file and of the parser source code) into a single cache key.
+
+    Parameters:
+    -----------
+    *parts : str
+        The digests identifying the cached result.
+
+    Returns:
+    --------
+    str
+        The hexadecimal SHA-256 digest of the combined parts.
+    """
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def get_cache_path(cache_dir, key):
+    """
+    Returns the path of the file holding a cached result.
+
+    Parameters:
+    -----------
+    cache_dir : str
+        The path to the cache folder.
+    key : str
+        The cache key of the result.
+
+    Returns:
+    --------
+    str
+        The path to the cache file.
+    """
+    return os.path.join(cache_dir, f"{key}.pkl")
+
+
+def load_from_cache(cache_dir, key):
+    """
+    Loads a cached result. The modification time of the cache file is refreshed, so that entries which are
+    still in use are evicted last.
+
+    Parameters:
+    -----------
+    cache_dir : str
+        The path to the cache folder.
+    key : str
+        The cache key of the result.
+
+    Returns:
+    --------
+    object
+        The cached result, or None if there is no usable entry for the key.
+    """
+    cache_path = get_cache_path(cache_dir, key)
+    try:
+        with open(cache_path, "rb") as f:
+            value = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+        logging.warning(f"Ignoring unreadable cache entry {cache_path}: {e}")
+        return None
+    os.utime(cache_path)
+    return value
+
+
+def save_to_cache(cache_dir, key, value):
+    """
+    Saves a result to the cache. The entry is written to a temporary file first and then renamed, so
+    that an interrupted run never leaves a truncated entry behind.
+
+    Parameters:
+    -----------
+    cache_dir : str
+        The path to the cache folder.
+    key : str
+        The cache key of the result.
+    value : object
+        The picklable result to be cached.
+
+    Returns:
+    --------
+    None
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    cache_path = get_cache_path(cache_dir, key)
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, cache_path)
+
+
+def prune_cache(cache_dir, max_size=None, max_age=None):
+    """
+    Evicts cache entries older than max_age, then the least recently used entries until the total
+    size of the cache is at most max_size.
+
+    Parameters:
+    -----------
+    cache_dir : str
+        The path to the cache folder.
+    max_size : int, optional
+        The maximum total size of the cache in bytes. The size is not limited if None.
+    max_age : float, optional
+        The maximum age of an entry in seconds since it was last used. The age is not limited if None.
+
+    Returns:
+    --------
+    int
+        The number of evicted entries.
+    """
+    if not os.path.isdir(cache_dir):
+        return 0
+
+    entries = []
+    for filename in os.listdir(cache_dir):
+        if filename.endswith(".pkl"):
+            stat = os.stat(os.path.join(cache_dir, filename))
+            entries.append((stat.st_mtime, stat.st_size, filename))
+    entries.sort()
+
+    now, total_size = time.time(), sum(size for _, size, _ in entries)
+    evicted = 0
+    for mtime, size, filename in entries:
+        too_old = max_age is not None and now - mtime > max_age
+        too_big = max_size is not None and total_size > max_size
+        if not (too_old or too_big):
+            continue
+        os.remove(os.path.join(cache_dir, filename))
+        total_size -= size
+        evicted += 1
+
+    if evicted:
+        logging.info(f"Evicted {evicted} entries from {cache_dir}")
+    return evicted
@@ -0,0 +1,120 @@
+import os
+import pickle
+import shutil
+import logging
+
+# Name of the file holding the parsing state and position of a checkpoint
+CHECKPOINT_FILENAME = "checkpoint.pkl"
+
+# Name of the file the completed records are appended to
+RECORDS_FILENAME = "records.pkl"
+
+
+class PageCheckpoint:
+    """
+    Saves the progress of a page-level parser over a section to a folder, so that a rerun after a crash resumes
+    after the last checkpointed page instead of parsing the section from its first page.
+
+    The completed records are appended to a records file, and the parsing state (the entry in progress and any
+    state the parser carries across pages) is saved with the position in the section, the pages quarantined so
+    far and the size of the records file. The state is written to a temporary file that replaces the previous
+    one, so an interrupted save leaves the previous checkpoint intact, and records appended after it are
+    truncated on resume.
+
+    Attributes:
+    -----------
+    checkpoint_dir : str
+        The path to the folder holding the checkpoint of the section.
+    key : str
+        A digest of the PDF file and the parser. Checkpoints saved under another key are discarded.
+    interval : int
+        The number of pages parsed between two checkpoints.
+    quarantined : list of int
+        The indices of the pages that failed to parse, filled by the caller. It is saved with each checkpoint and
+        extended in place with the saved pages when resuming, so pages quarantined before a crash are not lost.
+    """
+
+    def __init__(self, checkpoint_dir, key, interval=50, quarantined=None):
+        self.checkpoint_dir = checkpoint_dir
+        self.key = key
+        self.interval = interval
+        self.quarantined = [] if quarantined is None else quarantined
+
+    def load(self):
+        """
+        Loads the last checkpoint and the records completed before it.
+
+        Returns:
+        --------
+        tuple or None
+            A (position, state, records) tuple, where position is the index in the section of the next page to be
+            parsed, or None if there is no checkpoint to resume from.
+        """
+        state_path = os.path.join(self.checkpoint_dir, CHECKPOINT_FILENAME)
+        try:
+            with open(state_path, "rb") as f:
+                checkpoint = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+            logging.warning(f"Ignoring unreadable checkpoint {state_path}: {e}")
+            self.clear()
+            return None
+        if checkpoint["key"] != self.key:
+            logging.info(f"Discarding stale checkpoint {self.checkpoint_dir}")
+            self.clear()
+            return None
+
+        records_path = os.path.join(self.checkpoint_dir, RECORDS_FILENAME)
+        records = []
+        with open(records_path, "r+b") as f:
+            f.truncate(checkpoint["records_size"])
+            while f.tell() < checkpoint["records_size"]:
+                records.extend(pickle.load(f))
+        self.quarantined.extend(checkpoint.get("quarantined", []))
+        return checkpoint["position"], checkpoint["state"], records
+
+    def save(self, position, state, records):
+        """
+        Appends the records completed since the last checkpoint and saves the parsing state.
+
+        Parameters:
+        -----------
+        position : int
+            The index in the section of the next page to be parsed.
+        state : dict
+            The parsing state after the last parsed page.
+        records : list of dict
+            The records completed since the last checkpoint.
+
+        Returns:
+        --------
+        None
+        """
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        with open(os.path.join(self.checkpoint_dir, RECORDS_FILENAME), "ab") as f:
+            if records:
+                pickle.dump(records, f, protocol=pickle.HIGHEST_PROTOCOL)
+            records_size = f.tell()
+
+        state_path = os.path.join(self.checkpoint_dir, CHECKPOINT_FILENAME)
+        temp_path = f"{state_path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            pickle.dump(
+                dict(
+                    key=self.key,
+                    position=position,
+                    state=state,
+                    quarantined=self.quarantined,
+                    records_size=records_size,
+                ),
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(temp_path, state_path)
+
+    def clear(self):
+        """
+        Removes the checkpoint, once the section is parsed completely.
+        """
+        shutil.rmtree(self.checkpoint_dir, ignore_errors=True)
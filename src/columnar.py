@@ -0,0 +1,161 @@
+import os
+import importlib.util
+from .aggregate import get_partition_dir
+
+# Whether the Parquet dataset can be written and read. pyarrow is optional, the CSV files are written without
+# it, and it is imported on first use like pandas, so importing the package does not load either
+PARQUET_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+# Columns stored as dictionary-encoded (categorical) columns, in addition to the year partition
+CATEGORICAL_COLUMNS = ["header"]
+
+
+def get_parquet_path(dataset_dir, year, name):
+    """
+    Returns the path of a file in the Parquet dataset, which is partitioned by year into year=YYYY folders.
+
+    Parameters:
+    -----------
+    dataset_dir : str
+        The path to the folder holding the Parquet dataset.
+    year : str
+        The year of the file.
+    name : str
+        The name of the file, without extension.
+
+    Returns:
+    --------
+    str
+        The path to the Parquet file.
+    """
+    return os.path.join(get_partition_dir(dataset_dir, year), f"{name}.parquet")
+
+
+def save_df_to_parquet(df, dataset_dir, name, year):
+    """
+    Saves a DataFrame to the partition of its year in the Parquet dataset. The year is encoded in the partition
+    folder instead of a column, and the columns in CATEGORICAL_COLUMNS are dictionary-encoded.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        The DataFrame to be saved.
+    dataset_dir : str
+        The path to the folder holding the Parquet dataset.
+    name : str
+        The name of the file, without extension.
+    year : str
+        The year of the partition.
+
+    Returns:
+    --------
+    str
+        The path to the Parquet file.
+    """
+    parquet_path = get_parquet_path(dataset_dir, year, name)
+    os.makedirs(os.path.dirname(parquet_path), exist_ok=True)
+    df = df.drop(columns="year", errors="ignore").astype(
+        {column: "category" for column in CATEGORICAL_COLUMNS if column in df}
+    )
+    # The temporary file is hidden, so that it is never read as part of the dataset
+    temp_path = os.path.join(os.path.dirname(parquet_path), f".{name}.parquet.tmp")
+    df.to_parquet(temp_path, engine="pyarrow", index=False)
+    os.replace(temp_path, parquet_path)
+    return parquet_path
+
+
+def is_up_to_date(parquet_path, source_path):
+    """
+    Checks whether a Parquet file exists and was written after the file it was converted from.
+
+    Parameters:
+    -----------
+    parquet_path : str
+        The path to the Parquet file.
+    source_path : str
+        The path to the source file, e.g. the CSV file saved alongside it.
+
+    Returns:
+    --------
+    bool
+        True if the Parquet file can be read instead of the source file, otherwise False.
+    """
+    return (
+        os.path.exists(parquet_path)
+        and os.stat(parquet_path).st_mtime_ns >= os.stat(source_path).st_mtime_ns
+    )
+
+
+def read_parquet_file(parquet_path, columns=None):
+    """
+    Reads the given columns of a single Parquet file. Only the requested columns are read from disk, and
+    columns the file does not have are left out.
+
+    Parameters:
+    -----------
+    parquet_path : str
+        The path to the Parquet file.
+    columns : list of str, optional
+        The columns to be read. All columns are read if None.
+
+    Returns:
+    --------
+    pd.DataFrame
+        The columns of the file that were requested.
+    """
+    import pandas as pd
+    import pyarrow.parquet as pq
+
+    if columns is not None:
+        names = pq.read_schema(parquet_path).names
+        columns = [column for column in columns if column in names]
+    return pd.read_parquet(parquet_path, engine="pyarrow", columns=columns)
+
+
+def read_abstracts(dataset_dir, columns=None, years=None):
+    """
+    Reads the abstracts of the Parquet dataset into a single DataFrame. Only the requested columns and the
+    partitions of the requested years are read from disk. The year and the header are returned as categorical
+    columns, and columns missing from some of the files are filled with nulls.
+
+    Parameters:
+    -----------
+    dataset_dir : str
+        The path to the folder holding the Parquet dataset.
+    columns : list of str, optional
+        The columns to be read, e.g. ["title", "content", "header", "year"]. All columns are read if None.
+    years : iterable of int or str, optional
+        The years to be read. All years are read if None.
+
+    Returns:
+    --------
+    pd.DataFrame
+        The abstracts of the requested years.
+
+    Raises:
+    -------
+    ImportError
+        If pyarrow is not installed.
+    """
+    if not PARQUET_AVAILABLE:
+        raise ImportError("Reading the Parquet dataset requires pyarrow")
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    # Discover the years from the partition folders as a dictionary-encoded column
+    partitioning = ds.HivePartitioning.discover(infer_dictionary=True)
+    dataset = ds.dataset(dataset_dir, format="parquet", partitioning=partitioning)
+    # Files of different years do not share all columns, so take the union of their schemas
+    schema = pa.unify_schemas(
+        [fragment.physical_schema for fragment in dataset.get_fragments()]
+        + [pa.schema([dataset.schema.field("year")])]
+    )
+    dataset = ds.dataset(
+        dataset_dir, schema=schema, format="parquet", partitioning=partitioning
+    )
+    row_filter = (
+        ds.field("year").isin([int(year) for year in years])
+        if years is not None
+        else None
+    )
+    return dataset.to_table(columns=columns, filter=row_filter).to_pandas()
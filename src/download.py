@@ -0,0 +1,482 @@
+import os
+import re
+import json
+import time
+import logging
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from .cache import hash_file
+
+# Number of bytes written to disk at a time while a file is streamed
+CHUNK_SIZE = 1 << 16
+
+# HTTP status codes of transient errors after which a download is retried
+RETRY_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+def create_session(pool_size=4):
+    """
+    Creates an HTTP session whose connections are pooled and reused across requests and threads.
+
+    Parameters:
+    -----------
+    pool_size : int, optional
+        The maximum number of connections kept open per host.
+
+    Returns:
+    --------
+    requests.Session
+        The HTTP session.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def is_retryable(error):
+    """
+    Checks whether a failed request is worth retrying, i.e. whether it failed on a dropped connection, a
+    timeout, a truncated response or a transient server error.
+
+    Parameters:
+    -----------
+    error : requests.RequestException
+        The error raised by the request.
+
+    Returns:
+    --------
+    bool
+        True if the request should be retried, otherwise False.
+    """
+    if isinstance(error, requests.HTTPError):
+        return (
+            error.response is not None
+            and error.response.status_code in RETRY_STATUS_CODES
+        )
+    return isinstance(
+        error,
+        (
+            requests.ConnectionError,
+            requests.Timeout,
+            requests.exceptions.ChunkedEncodingError,
+        ),
+    )
+
+
+def load_manifest(manifest_path):
+    """
+    Loads the manifest of downloaded files, which records for each file the URL it was downloaded from,
+    the ETag and Last-Modified validators sent by the server, and its size, modification time and SHA-256 digest.
+
+    Parameters:
+    -----------
+    manifest_path : str
+        The path to the manifest file.
+
+    Returns:
+    --------
+    dict
+        A dictionary mapping each filename to its manifest entry, empty if there is no readable manifest.
+    """
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        logging.warning(f"Ignoring unreadable manifest {manifest_path}: {e}")
+        return {}
+
+
+def save_manifest(manifest_path, manifest):
+    """
+    Saves the manifest of downloaded files. The manifest is written to a temporary file first and then
+    renamed, so that an interrupted run never leaves a truncated manifest behind.
+
+    Parameters:
+    -----------
+    manifest_path : str
+        The path to the manifest file.
+    manifest : dict
+        A dictionary mapping each filename to its manifest entry.
+
+    Returns:
+    --------
+    None
+    """
+    temp_path = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(manifest.items())), f, indent=2)
+    os.replace(temp_path, manifest_path)
+
+
+def record_file(manifest, file_path, link, headers, sha256=None):
+    """
+    Records a downloaded file in the manifest.
+
+    Parameters:
+    -----------
+    manifest : dict
+        A dictionary mapping each filename to its manifest entry.
+    file_path : str
+        The path to the downloaded file.
+    link : str
+        The URL the file was downloaded from.
+    headers : mapping
+        The response headers holding the ETag and Last-Modified validators of the file.
+    sha256 : str, optional
+        The SHA-256 digest of the file, computed if None.
+
+    Returns:
+    --------
+    None
+    """
+    stat = os.stat(file_path)
+    manifest[os.path.basename(file_path)] = dict(
+        url=link,
+        etag=headers.get("ETag"),
+        last_modified=headers.get("Last-Modified"),
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        sha256=sha256 or hash_file(file_path),
+    )
+
+
+def get_file_hash(file_path, manifest=None):
+    """
+    Returns the SHA-256 digest of a file, taken from the manifest if the size and modification time of the
+    file are still the ones recorded, so that unchanged files are not read again.
+
+    Parameters:
+    -----------
+    file_path : str
+        The path to the file.
+    manifest : dict, optional
+        A dictionary mapping each filename to its manifest entry.
+
+    Returns:
+    --------
+    str
+        The hexadecimal SHA-256 digest of the file.
+    """
+    entry = (manifest or {}).get(os.path.basename(file_path))
+    stat = os.stat(file_path)
+    if entry and (entry["size"], entry["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+        return entry["sha256"]
+    return hash_file(file_path)
+
+
+def get_expected_size(response):
+    """
+    Returns the full size of the file being downloaded, as announced by the server.
+
+    Parameters:
+    -----------
+    response : requests.Response
+        The response to a request for the file.
+
+    Returns:
+    --------
+    int
+        The size of the file in bytes, or None if the server did not announce it.
+    """
+    if response.status_code == 206:
+        match = re.search(r"/(\d+)$", response.headers.get("Content-Range", ""))
+        return int(match.group(1)) if match else None
+    length = response.headers.get("Content-Length")
+    return int(length) if length is not None else None
+
+
+def fetch_to_file(session, link, part_path, timeout=60, headers=None, validators=None):
+    """
+    Streams the body of a URL into a partial file. If the partial file already holds the start of the body,
+    only the remaining bytes are requested with an HTTP Range request and appended. The range is made
+    conditional on the validator of the partial file with If-Range, so the server sends the whole body instead
+    if the file changed since. The whole body is also requested again if the server does not honor the range.
+
+    Parameters:
+    -----------
+    session : requests.Session
+        The HTTP session used for the request.
+    link : str
+        The URL of the file to be downloaded.
+    part_path : str
+        The path to the partial file.
+    timeout : float, optional
+        The number of seconds to wait for the server to connect or send data.
+    headers : dict, optional
+        Further request headers, e.g. the validators of a conditional request.
+    validators : dict, optional
+        The 'etag' and 'last_modified' validators of the file the partial file belongs to, sent with If-Range
+        when resuming. The dictionary is updated with the validators of a response whose body is written from
+        the start, so a retry resumes against the right version of the file.
+
+    Returns:
+    --------
+    mapping
+        The response headers, or None if the server answered a conditional request with 304 Not Modified. If
+        the partial file already holds the whole body, the headers hold the validators it was resumed against.
+
+    Raises:
+    -------
+    requests.RequestException
+        If the request fails or the body is cut off before it is complete.
+    """
+    validators = {} if validators is None else validators
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    request_headers = dict(headers or {})
+    if offset:
+        request_headers["Range"] = f"bytes={offset}-"
+        # Weak ETags cannot be used with If-Range, the Last-Modified date is used instead
+        etag = validators.get("etag")
+        if_range = etag if etag and not etag.startswith("W/") else None
+        if_range = if_range or validators.get("last_modified")
+        if if_range:
+            request_headers["If-Range"] = if_range
+
+    with session.get(
+        link, headers=request_headers, stream=True, timeout=timeout
+    ) as response:
+        if response.status_code == 304:
+            return None
+        if offset and response.status_code == 416:
+            # The range starts at or beyond the end of the file, which is complete if the sizes agree. The 416
+            # response does not describe the file, so the validators it was resumed against are kept
+            if response.headers.get("Content-Range") == f"bytes */{offset}":
+                return {
+                    "ETag": validators.get("etag"),
+                    "Last-Modified": validators.get("last_modified"),
+                }
+            # Otherwise the partial file does not belong to the current file, so start over
+            os.remove(part_path)
+            return fetch_to_file(session, link, part_path, timeout, headers, validators)
+        response.raise_for_status()
+
+        resumed = offset and response.status_code == 206
+        if resumed:
+            logging.info(f"Resuming {link} from byte {offset}")
+        else:
+            validators.update(
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+        with open(part_path, "ab" if resumed else "wb") as f:
+            for chunk in response.iter_content(CHUNK_SIZE):
+                f.write(chunk)
+
+        # Check the assembled file against the size announced by the server
+        expected_size = get_expected_size(response)
+        if expected_size is not None and os.path.getsize(part_path) != expected_size:
+            os.remove(part_path)
+            raise requests.exceptions.ChunkedEncodingError(
+                f"Downloaded {link} does not have the announced size of {expected_size} bytes"
+            )
+        return response.headers
+
+
+def head_if_same_size(file_path, link, session, timeout=60):
+    """
+    Sends a HEAD request for a URL and checks whether the server reports the size of a local file as its
+    Content-Length.
+
+    Parameters:
+    -----------
+    file_path : str
+        The path to the local file.
+    link : str
+        The URL of the file.
+    session : requests.Session
+        The HTTP session used for the request.
+    timeout : float, optional
+        The number of seconds to wait for the server to connect or send data.
+
+    Returns:
+    --------
+    mapping
+        The headers of the HEAD response if the sizes agree, otherwise None.
+    """
+    try:
+        response = session.head(link, allow_redirects=True, timeout=timeout)
+        response.raise_for_status()
+    except requests.RequestException:
+        return None
+    if response.headers.get("Content-Length") != str(os.path.getsize(file_path)):
+        return None
+    return response.headers
+
+
+def check_local_file(file_path, link, session, manifest, timeout=60):
+    """
+    Checks a previously downloaded file against its manifest entry and returns the validators for a
+    conditional request. A file whose content no longer matches its recorded SHA-256 digest is treated as
+    missing. A file without an entry, e.g. downloaded before the manifest existed, is adopted if the server
+    reports the same size for it. If the server sent no validators for the file, its size is compared with
+    the one the server reports instead.
+
+    Parameters:
+    -----------
+    file_path : str
+        The path to the local file.
+    link : str
+        The URL of the file.
+    session : requests.Session
+        The HTTP session used for the requests.
+    manifest : dict
+        A dictionary mapping each filename to its manifest entry.
+    timeout : float, optional
+        The number of seconds to wait for the server to connect or send data.
+
+    Returns:
+    --------
+    dict
+        The request headers of a conditional request for the file, an empty dictionary if the file has no
+        validators but the server reports its size, or None if the file must be downloaded unconditionally.
+    """
+    filename = os.path.basename(file_path)
+    entry = manifest.get(filename)
+    head_headers = None
+
+    if entry is None:
+        head_headers = head_if_same_size(file_path, link, session, timeout)
+        if head_headers is None:
+            return None
+        record_file(manifest, file_path, link, head_headers)
+        entry = manifest[filename]
+        logging.info(f"Added {file_path} to the manifest")
+
+    sha256 = get_file_hash(file_path, manifest)
+    if sha256 != entry["sha256"]:
+        logging.warning(
+            f"{file_path} does not match its recorded checksum, downloading it again"
+        )
+        return None
+    # Remember the new modification time of a file whose content is unchanged
+    entry["mtime_ns"] = os.stat(file_path).st_mtime_ns
+
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    if headers:
+        return headers
+    # Without validators, the file is only kept if the server still reports the same size for it
+    if head_headers is None:
+        head_headers = head_if_same_size(file_path, link, session, timeout)
+    return {} if head_headers is not None else None
+
+
+def download_file(
+    link, folder_path, session=None, manifest=None, retries=3, backoff=1.0, timeout=60
+):
+    """
+    Downloads a file from the given URL and saves it to the specified folder. If the
+    file already exists, it will not be downloaded again.
+
+    The file is streamed into a partial file next to the target, which is renamed into place once it is
+    complete, so an interrupted download never leaves a truncated file behind. Transient errors are retried
+    with exponential backoff, resuming from the bytes already received.
+
+    If a manifest is given, an existing file is verified against its recorded checksum and refreshed with a
+    conditional request instead, so it is only downloaded again if it is corrupted or changed on the server.
+
+    Parameters:
+    -----------
+    link : str
+        The URL of the file to be downloaded.
+    folder_path : str
+        The path to the folder where the file should be saved.
+    session : requests.Session, optional
+        The HTTP session used for the requests. A new session is created if None.
+    manifest : dict, optional
+        A dictionary mapping each filename to its manifest entry, updated with the downloaded file.
+    retries : int, optional
+        The maximum number of times a failed download is retried.
+    backoff : float, optional
+        The number of seconds to wait before the first retry, doubled for every further retry.
+    timeout : float, optional
+        The number of seconds to wait for the server to connect or send data.
+
+    Returns:
+    --------
+    str
+        The path to the downloaded file, or None if the download failed.
+    """
+    filename = os.path.join(folder_path, link.split("/")[-1])
+    session = session or create_session()
+    headers = None
+    if os.path.exists(filename):
+        if manifest is None:
+            logging.info(f"{filename} already exists in {folder_path}")
+            return filename
+        headers = check_local_file(filename, link, session, manifest, timeout)
+        if headers == {}:
+            logging.info(f"{filename} has the size reported by the server")
+            return filename
+
+    # A partial file left by an earlier run is resumed against the validators of the last download
+    entry = (manifest or {}).get(os.path.basename(filename), {})
+    validators = dict(etag=entry.get("etag"), last_modified=entry.get("last_modified"))
+    part_path = f"{filename}.part"
+    for attempt in range(retries + 1):
+        try:
+            response_headers = fetch_to_file(
+                session, link, part_path, timeout, headers, validators
+            )
+            if response_headers is None:
+                logging.info(f"{filename} is up to date")
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+                return filename
+            os.replace(part_path, filename)
+            if manifest is not None:
+                record_file(manifest, filename, link, response_headers)
+            logging.info(f"Successfully downloaded {filename}")
+            return filename
+        except requests.RequestException as e:
+            if attempt == retries or not is_retryable(e):
+                logging.error(f"Error downloading {link}: {e}")
+                return None
+            delay = backoff * 2**attempt
+            logging.warning(f"Retrying {link} in {delay:g}s after error: {e}")
+            time.sleep(delay)
+
+
+def download_files(links, folder_path, workers=4, session=None, **kwargs):
+    """
+    Downloads files concurrently in a pool of threads sharing one HTTP session, so that connections to the
+    same host are reused. Links to the same filename are only downloaded once.
+
+    Parameters:
+    -----------
+    links : iterable of str
+        The URLs of the files to be downloaded.
+    folder_path : str
+        The path to the folder where the files should be saved.
+    workers : int, optional
+        The maximum number of files downloaded at the same time.
+    session : requests.Session, optional
+        The HTTP session used for the requests. A new session is created if None.
+    **kwargs
+        Further arguments passed to download_file (manifest, retries, backoff, timeout).
+
+    Returns:
+    --------
+    list of str
+        The paths to the downloaded files, in the order of the links, with None for failed downloads.
+        Links to a filename already listed are left out.
+    """
+    unique_links = {}
+    for link in links:
+        unique_links.setdefault(link.split("/")[-1], link)
+    session = session or create_session(workers)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(
+                lambda link: download_file(link, folder_path, session, **kwargs),
+                unique_links.values(),
+            )
+        )
@@ -6,3 +6,18 @@ class ParsingStage(Enum):
     AUTHORS = "AUTHORS"
     AFFILIATIONS = "AFFILIATIONS"
     CONTENT = "CONTENT"
+
+
+class LineKind(Enum):
+    SKIP = "SKIP"
+    TOPIC = "TOPIC"
+    TITLE = "TITLE"
+    AUTHORS = "AUTHORS"
+    AFFILIATIONS = "AFFILIATIONS"
+    CONTENT = "CONTENT"
+
+
+class PageKind(Enum):
+    FRONT_MATTER = "FRONT_MATTER"
+    SECTION = "SECTION"
+    ABSTRACT = "ABSTRACT"
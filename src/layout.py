@@ -0,0 +1,628 @@
+import os
+import re
+import json
+import shutil
+import logging
+import numpy as np
+from .cache import hash_file
+
+# Version of the on-disk layout, stores written by other versions are rebuilt
+LAYOUT_VERSION = 4
+
+# Translation table normalizing the text of every span once when it is extracted, so that the helpers and parsers
+# never scan lines for these characters:
+#   -- ligatures are expanded, including the "ti" ligature the 2023 books render as U+019F
+#   -- NUL and the whitespace control characters, e.g. tabs, and no-break spaces become spaces
+#   -- soft hyphens are removed. normalize_text first turns the soft hyphens between two letters into hyphens,
+#      as the 2016 and 2018 books extract compound hyphens, e.g. "genome-wide", as soft hyphens, and keeps a
+#      soft hyphen ending a span, as it marks a word broken at the end of a line, which is joined with the next
+#   -- other control characters, e.g. the BEL characters of the 2015 books, are removed
+TEXT_TRANSLATION = str.maketrans(
+    {
+        **{chr(code): None for code in [*range(0x20), *range(0x7F, 0xA0)]},
+        **dict.fromkeys("\x00\t\n\x0b\x0c\r\xa0", " "),
+        "\xad": None,
+        "\ufb00": "ff",
+        "\ufb01": "fi",
+        "\ufb02": "fl",
+        "\ufb03": "ffi",
+        "\ufb04": "ffl",
+        "\ufb05": "st",
+        "\ufb06": "st",
+        "\u019f": "ti",
+    }
+)
+
+# Soft hyphens between two letters, which are compound hyphens
+INNER_SOFT_HYPHEN_PATTERN = re.compile(r"(?<=[^\W\d_])\xad(?=[^\W\d_])")
+
+# Ligatures the 2023 books extract at the edge of a span within a word, e.g. "Mul", "Ɵ" and "-ancestry"
+SPLIT_LIGATURES = ("\u019f",)
+
+# Columns of the layout store, each saved as a separate .npy file that can be memory-mapped
+LAYOUT_COLUMNS = [
+    "page_size",  # (n_pages, 2) width and height of each page
+    "page_blocks",  # (n_pages + 1,) offsets of the blocks of each page
+    "block_type",  # (n_blocks,) 0 for text blocks, 1 for image blocks
+    "block_bbox",  # (n_blocks, 4) bounding box of each block
+    "block_lines",  # (n_blocks + 1,) offsets of the lines of each block
+    "line_bbox",  # (n_lines, 4) bounding box of each line
+    "line_spans",  # (n_lines + 1,) offsets of the spans of each line
+    "span_bbox",  # (n_spans, 4) bounding box of each span
+    "span_size",  # (n_spans,) font size of each span
+    "span_flags",  # (n_spans,) font flags of each span
+    "span_color",  # (n_spans,) color of each span
+    "span_font",  # (n_spans,) index of the font of each span in fonts.json
+    "span_text",  # (n_spans + 1,) offsets of the text of each span in text.bin
+]
+
+
+class Span:
+    """
+    A run of text in a single font, as extracted from a page.
+
+    Attributes:
+    -----------
+    text : str
+        The text of the span.
+    font : str
+        The name of the font of the span.
+    size : float
+        The font size of the span.
+    bbox : tuple of float
+        The bounding box coordinates (x0, y0, x1, y1) of the span.
+    """
+
+    __slots__ = ("text", "font", "size", "bbox")
+
+    def __init__(self, text, font, size, bbox):
+        self.text = text
+        self.font = font
+        self.size = size
+        self.bbox = bbox
+
+    @classmethod
+    def from_dict(cls, span):
+        return cls(
+            normalize_text(span["text"]), span["font"], span["size"], span["bbox"]
+        )
+
+    def __repr__(self):
+        return f"Span(text={self.text!r}, font={self.font!r}, size={self.size!r}, bbox={self.bbox!r})"
+
+
+class Line:
+    """
+    A line of text made of spans, as rebuilt from the lines of the text blocks of a page.
+
+    The text of the line is computed once when the line is built and after its spans change, and the fonts
+    and text segments are computed on first use, so that the predicates and parsers never rebuild them.
+
+    Attributes:
+    -----------
+    spans : list of Span
+        The spans of the line.
+    bbox : list of float
+        The bounding box coordinates [x0, y0, x1, y1] of the line.
+    text : str
+        The concatenated text of the spans.
+    fonts : list of str or None
+        The font of each text segment, or None if not computed yet.
+    texts : list of str or None
+        The text segments of the spans, or None if not computed yet.
+    """
+
+    __slots__ = ("spans", "bbox", "text", "fonts", "texts")
+
+    def __init__(self, spans, bbox):
+        self.spans = spans
+        self.bbox = bbox
+        self.update_text()
+
+    @classmethod
+    def from_dict(cls, line):
+        return cls(
+            list(map(Span.from_dict, merge_split_spans(line["spans"]))),
+            list(line["bbox"]),
+        )
+
+    def update_text(self):
+        """
+        Recomputes the text of the line from its spans and resets its fonts and text segments.
+        """
+        self.text = " ".join(self.get_span_texts()).rstrip()
+        self.fonts = self.texts = None
+
+    def update_fonts_and_texts(self):
+        """
+        Computes the fonts and text segments of the line, one per span.
+        """
+        self.fonts = [span.font for span in self.spans]
+        self.texts = self.get_span_texts()
+
+    def get_span_texts(self):
+        """
+        Returns the text of each span of the line. Only a soft hyphen ending the line is kept, soft hyphens ending
+        spans within the line, e.g. of merged lines, are removed. The spans themselves are left unchanged, as they
+        may be shared with other lines.
+
+        Returns:
+        --------
+        list of str
+            The text of each span.
+        """
+        texts = [span.text for span in self.spans]
+        if any(text.endswith("\xad") for text in texts[:-1]):
+            last = max(
+                (idx for idx, text in enumerate(texts) if text.strip()), default=0
+            )
+            texts[:last] = [text.removesuffix("\xad") for text in texts[:last]]
+        return texts
+
+    def __repr__(self):
+        return f"Line(spans={self.spans!r}, bbox={self.bbox!r})"
+
+
+def normalize_text(text):
+    """
+    Normalizes the text of a span with TEXT_TRANSLATION. Soft hyphens between two letters become hyphens, and a
+    soft hyphen ending the span is kept, see ends_with_dash.
+
+    Parameters:
+    -----------
+    text : str
+        The text of a span, as extracted by PyMuPDF.
+
+    Returns:
+    --------
+    str
+        The normalized text.
+    """
+    if "\xad" not in text:
+        return text.translate(TEXT_TRANSLATION)
+    body = text.rstrip()
+    end = "\xad" if body.endswith("\xad") else ""
+    body = INNER_SOFT_HYPHEN_PATTERN.sub("-", body[:-1] if end else text)
+    return body.translate(TEXT_TRANSLATION) + end
+
+
+def merge_split_spans(spans):
+    """
+    Merges the spans of a line that are split at a ligature within a word, i.e. a span starting with one of
+    SPLIT_LIGATURES, or following a span ending with one, that continues the previous span in the same font.
+    Otherwise the lines would join the spans with spaces, breaking the word once the ligature is expanded.
+
+    Parameters:
+    -----------
+    spans : list of dict
+        The spans of a line, as extracted by PyMuPDF.
+
+    Returns:
+    --------
+    list of dict
+        The spans of the line, where the merged spans are replaced with a single span.
+    """
+    merged = spans[:1]
+    for span in spans[1:]:
+        previous = merged[-1]
+        if (
+            (
+                span["text"].startswith(SPLIT_LIGATURES)
+                or previous["text"].endswith(SPLIT_LIGATURES)
+            )
+            and span["font"] == previous["font"]
+            and span["size"] == previous["size"]
+            and abs(span["bbox"][0] - previous["bbox"][2]) < 1
+        ):
+            merged[-1] = dict(
+                previous,
+                text=previous["text"] + span["text"],
+                bbox=(
+                    previous["bbox"][0],
+                    min(previous["bbox"][1], span["bbox"][1]),
+                    span["bbox"][2],
+                    max(previous["bbox"][3], span["bbox"][3]),
+                ),
+            )
+        else:
+            merged.append(span)
+    return merged
+
+
+def build_layout_store(document, store_dir, source_hash=""):
+    """
+    Extracts the span-level layout (text, font, size and bounding boxes) of every page of a document once and
+    saves it as columnar arrays, so that the layout can be parsed repeatedly without reopening the PDF. The spans
+    split at a ligature are merged with merge_split_spans, and the text of each span is normalized with
+    normalize_text.
+
+    The store is written to a temporary folder that replaces store_dir when complete.
+
+    Parameters:
+    -----------
+    document : object
+        A PyMuPDF document object.
+    store_dir : str
+        The path to the folder the layout store is saved to.
+    source_hash : str, optional
+        The SHA-256 digest of the PDF file, used to detect stale stores.
+
+    Returns:
+    --------
+    None
+    """
+    columns = {name: [] for name in LAYOUT_COLUMNS}
+    fonts, texts, text_offset = {}, [], 0
+    for name in ["page_blocks", "block_lines", "line_spans", "span_text"]:
+        columns[name].append(0)
+
+    for page in document:
+        page_dict = page.get_text("dict")
+        columns["page_size"].append((page_dict["width"], page_dict["height"]))
+        for block in page_dict["blocks"]:
+            columns["block_type"].append(0 if "lines" in block else 1)
+            columns["block_bbox"].append(block["bbox"])
+            for line in block.get("lines", []):
+                columns["line_bbox"].append(line["bbox"])
+                for span in merge_split_spans(line["spans"]):
+                    text = normalize_text(span["text"]).encode("utf-8", "surrogatepass")
+                    texts.append(text)
+                    text_offset += len(text)
+                    columns["span_bbox"].append(span["bbox"])
+                    columns["span_size"].append(span["size"])
+                    columns["span_flags"].append(span["flags"])
+                    columns["span_color"].append(span["color"])
+                    columns["span_font"].append(
+                        fonts.setdefault(span["font"], len(fonts))
+                    )
+                    columns["span_text"].append(text_offset)
+                columns["line_spans"].append(len(columns["span_size"]))
+            columns["block_lines"].append(len(columns["line_bbox"]))
+        columns["page_blocks"].append(len(columns["block_type"]))
+
+    dtypes = dict(
+        page_size=np.float64,
+        block_type=np.int8,
+        block_bbox=np.float64,
+        line_bbox=np.float64,
+        span_bbox=np.float64,
+        span_size=np.float64,
+        span_flags=np.int32,
+        span_color=np.int64,
+        span_font=np.int32,
+    )
+    shapes = dict(
+        page_size=(-1, 2), block_bbox=(-1, 4), line_bbox=(-1, 4), span_bbox=(-1, 4)
+    )
+
+    temp_dir = f"{store_dir}.{os.getpid()}.tmp"
+    shutil.rmtree(temp_dir, ignore_errors=True)
+    os.makedirs(temp_dir)
+    for name, values in columns.items():
+        array = np.array(values, dtype=dtypes.get(name, np.int64))
+        np.save(
+            os.path.join(temp_dir, f"{name}.npy"),
+            array.reshape(shapes.get(name, (-1,))),
+        )
+    with open(os.path.join(temp_dir, "text.bin"), "wb") as f:
+        f.write(b"".join(texts))
+    with open(os.path.join(temp_dir, "fonts.json"), "w", encoding="utf-8") as f:
+        json.dump(list(fonts), f)
+    with open(os.path.join(temp_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(dict(version=LAYOUT_VERSION, source_hash=source_hash), f)
+
+    shutil.rmtree(store_dir, ignore_errors=True)
+    os.replace(temp_dir, store_dir)
+    logging.info(f"Saved layout store to {store_dir}")
+
+
+def is_layout_store_valid(store_dir, source_hash):
+    """
+    Checks if a layout store exists and was built from the given PDF file with the current layout version.
+
+    Parameters:
+    -----------
+    store_dir : str
+        The path to the folder of the layout store.
+    source_hash : str
+        The SHA-256 digest of the PDF file.
+
+    Returns:
+    --------
+    bool
+        True if the layout store can be used, otherwise False.
+    """
+    try:
+        with open(os.path.join(store_dir, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return False
+    return (
+        meta.get("version") == LAYOUT_VERSION and meta.get("source_hash") == source_hash
+    )
+
+
+def open_layout(file_path, layout_dir, source_hash=None):
+    """
+    Opens the layout store of a PDF file, extracting it first if it is missing or stale.
+
+    Parameters:
+    -----------
+    file_path : str
+        The path to the PDF file.
+    layout_dir : str
+        The path to the folder holding the layout stores of all PDF files.
+    source_hash : str, optional
+        The SHA-256 digest of the PDF file if it is already known, computed if None.
+
+    Returns:
+    --------
+    LayoutDocument
+        A document object reading the layout of the PDF file from its store.
+    """
+    store_dir = os.path.join(
+        layout_dir, os.path.splitext(os.path.basename(file_path))[0]
+    )
+    source_hash = source_hash or hash_file(file_path)
+    if not is_layout_store_valid(store_dir, source_hash):
+        # PyMuPDF is only needed to extract a missing or stale store
+        import fitz
+
+        build_layout_store(fitz.open(file_path), store_dir, source_hash)
+    return LayoutDocument(store_dir)
+
+
+class LayoutDocument:
+    """
+    A read-only document backed by a layout store. It mirrors the parts of the PyMuPDF document interface used
+    by the parsers (len, indexing, iteration and page.get_text with the "dict" or "text" option), so it can be
+    passed to any parser in place of a PDF document.
+    """
+
+    def __init__(self, store_dir):
+        self.name = store_dir
+        for name in LAYOUT_COLUMNS:
+            setattr(
+                self,
+                name,
+                np.load(os.path.join(store_dir, f"{name}.npy"), mmap_mode="r"),
+            )
+        text_path = os.path.join(store_dir, "text.bin")
+        self.text = (
+            np.memmap(text_path, dtype=np.uint8, mode="r")
+            if os.path.getsize(text_path)
+            else np.zeros(0, dtype=np.uint8)
+        )
+        with open(os.path.join(store_dir, "fonts.json"), encoding="utf-8") as f:
+            self.fonts = json.load(f)
+
+    def __len__(self):
+        return len(self.page_size)
+
+    def __getitem__(self, page_num):
+        if page_num < 0:
+            page_num += len(self)
+        if not 0 <= page_num < len(self):
+            raise IndexError(f"page {page_num} not in document")
+        return LayoutPage(self, page_num)
+
+    def __iter__(self):
+        for page_num in range(len(self)):
+            yield LayoutPage(self, page_num)
+
+
+class LayoutPage:
+    """
+    A page of a LayoutDocument.
+    """
+
+    def __init__(self, document, number):
+        self.parent = document
+        self.number = number
+
+    def get_text(self, option="dict"):
+        """
+        Rebuilds the PyMuPDF text dictionary of the page from the layout store.
+
+        Parameters:
+        -----------
+        option : str
+            The text extraction option, "dict" or "text".
+
+        Returns:
+        --------
+        dict or str
+            For "dict", a dictionary containing the width, height and blocks of the page, where text blocks
+            contain lines and spans with their text, font, size and bounding boxes. For "text", the plain text
+            of the page, as returned by get_plain_text.
+        """
+        if option == "text":
+            return self.get_plain_text()
+        if option != "dict":
+            raise ValueError(f"Unsupported text extraction option: {option}")
+
+        page = self.read_columns()
+        spans = [
+            dict(
+                size=page["span_size"][idx],
+                flags=page["span_flags"][idx],
+                font=page["span_font"][idx],
+                color=page["span_color"][idx],
+                text=page["span_text"][idx],
+                bbox=tuple(page["span_bbox"][idx]),
+            )
+            for idx in range(len(page["span_text"]))
+        ]
+        blocks = []
+        for block_type, bbox, lines in zip(
+            page["block_type"], page["block_bbox"], page["block_lines"]
+        ):
+            block = dict(type=block_type, bbox=tuple(bbox))
+            if block_type == 0:
+                block["lines"] = [
+                    dict(
+                        spans=spans[
+                            page["line_spans"][idx] : page["line_spans"][idx + 1]
+                        ],
+                        bbox=tuple(page["line_bbox"][idx]),
+                    )
+                    for idx in lines
+                ]
+            else:
+                block["image"] = None
+            blocks.append(block)
+
+        return dict(width=page["width"], height=page["height"], blocks=blocks)
+
+    def get_plain_text(self):
+        """
+        Reads the plain text of the page from the layout store, with each line of its text blocks followed by a
+        newline, like page.get_text("text") in PyMuPDF. Only the text of the page is decoded, so this is a cheap
+        probe of the content of a page compared to rebuilding its blocks.
+
+        Returns:
+        --------
+        str
+            The text of the lines of the page.
+        """
+        doc = self.parent
+        block_start, block_end = doc.page_blocks[self.number : self.number + 2].tolist()
+        line_start, line_end = doc.block_lines[[block_start, block_end]].tolist()
+        offsets = doc.span_text[doc.line_spans[line_start : line_end + 1]].tolist()
+        text = doc.text[offsets[0] : offsets[-1]].tobytes()
+        return "".join(
+            text[start - offsets[0] : end - offsets[0]].decode("utf-8", "surrogatepass")
+            + "\n"
+            for start, end in zip(offsets, offsets[1:])
+        )
+
+    def get_text_blocks(self):
+        """
+        Rebuilds the text blocks of the page from the layout store, with their lines as Line records.
+        Unlike get_text, no intermediate dictionaries are created for lines and spans.
+
+        Returns:
+        --------
+        dict
+            A dictionary containing the width and height of the page, its text blocks, each containing
+            its bounding box and lines, and the bounding boxes of the text blocks as an (n_blocks, 4) array.
+        """
+        page = self.read_columns()
+        spans = list(
+            map(
+                Span,
+                page["span_text"],
+                page["span_font"],
+                page["span_size"],
+                map(tuple, page["span_bbox"]),
+            )
+        )
+        blocks = [
+            dict(
+                bbox=tuple(bbox),
+                lines=[
+                    Line(
+                        spans[page["line_spans"][idx] : page["line_spans"][idx + 1]],
+                        page["line_bbox"][idx],
+                    )
+                    for idx in lines
+                ],
+            )
+            for block_type, bbox, lines in zip(
+                page["block_type"], page["block_bbox"], page["block_lines"]
+            )
+            if block_type == 0
+        ]
+        block_bbox = np.array(page["block_bbox"], dtype=float).reshape(-1, 4)
+        return dict(
+            width=page["width"],
+            height=page["height"],
+            blocks=blocks,
+            block_bbox=block_bbox[np.array(page["block_type"]) == 0],
+        )
+
+    def read_columns(self):
+        """
+        Reads the slices of the layout columns belonging to the page and converts them to Python objects.
+        Line and span offsets are made relative to the page.
+
+        Returns:
+        --------
+        dict
+            A dictionary of the page's columns, where 'block_lines' holds the range of line indices of each
+            block and 'span_text' holds the decoded text of each span.
+        """
+        doc = self.parent
+        width, height = doc.page_size[self.number].tolist()
+        block_start, block_end = doc.page_blocks[self.number : self.number + 2].tolist()
+        line_start, line_end = doc.block_lines[[block_start, block_end]].tolist()
+        span_start, span_end = doc.line_spans[[line_start, line_end]].tolist()
+
+        span_text = doc.span_text[span_start : span_end + 1].tolist()
+        text = doc.text[span_text[0] : span_text[-1]].tobytes()
+        offsets = [offset - span_text[0] for offset in span_text]
+        block_lines = [
+            offset - line_start
+            for offset in doc.block_lines[block_start : block_end + 1].tolist()
+        ]
+
+        return dict(
+            width=width,
+            height=height,
+            block_type=doc.block_type[block_start:block_end].tolist(),
+            block_bbox=doc.block_bbox[block_start:block_end].tolist(),
+            block_lines=[
+                range(start, end) for start, end in zip(block_lines, block_lines[1:])
+            ],
+            line_bbox=doc.line_bbox[line_start:line_end].tolist(),
+            line_spans=[
+                offset - span_start
+                for offset in doc.line_spans[line_start : line_end + 1].tolist()
+            ],
+            span_bbox=doc.span_bbox[span_start:span_end].tolist(),
+            span_size=doc.span_size[span_start:span_end].tolist(),
+            span_flags=doc.span_flags[span_start:span_end].tolist(),
+            span_color=doc.span_color[span_start:span_end].tolist(),
+            span_font=[
+                doc.fonts[font] for font in doc.span_font[span_start:span_end].tolist()
+            ],
+            span_text=[
+                text[start:end].decode("utf-8", "surrogatepass")
+                for start, end in zip(offsets, offsets[1:])
+            ],
+        )
+
+
+def get_text_blocks(page):
+    """
+    Extracts the text blocks of a page with their lines as Line records. Pages of a LayoutDocument build the
+    records directly from the layout store, other pages are converted from their PyMuPDF text dictionary.
+
+    Parameters:
+    -----------
+    page : object
+        A PyMuPDF page or a LayoutPage.
+
+    Returns:
+    --------
+    dict
+        A dictionary containing the width and height of the page, its text blocks, each containing
+        its bounding box and lines, and the bounding boxes of the text blocks as an (n_blocks, 4) array.
+    """
+    if isinstance(page, LayoutPage):
+        return page.get_text_blocks()
+
+    page_dict = page.get_text("dict")
+    blocks = [
+        dict(bbox=block["bbox"], lines=list(map(Line.from_dict, block["lines"])))
+        for block in page_dict["blocks"]
+        if "lines" in block
+    ]
+    return dict(
+        width=page_dict["width"],
+        height=page_dict["height"],
+        blocks=blocks,
+        block_bbox=np.array([block["bbox"] for block in blocks], dtype=float).reshape(
+            -1, 4
+        ),
+    )
@@ -1,14 +1,76 @@
-import os
-import pkgutil
 import importlib
 
-package_dir = os.path.dirname(__file__)
-for _, module_name, _ in pkgutil.iter_modules([package_dir]):
-    module = importlib.import_module(f"{__name__}.{module_name}")
+# Registry of the parser modules and the names each of them exports. A parser module is only imported when one
+# of its names is first accessed, so using one parser does not load the others.
+PARSER_MODULES = {
+    "parser_13_to_18": (
+        "MARKERS_13_TO_18",
+        "parser_13_to_18",
+        "iter_parser_13_to_18",
+        "parse_page_13_to_18",
+    ),
+    "parser_19": (
+        "LINE_PATTERNS_19",
+        "MARKERS_19",
+        "parser_19",
+        "iter_parser_19",
+        "parse_page_19",
+    ),
+    "parser_21": (
+        "SECTION_HEADINGS_21",
+        "PAGE_RANGES_21",
+        "SECTIONS_21",
+        "LINE_PATTERNS_21",
+        "MARKERS_21",
+        "parser_21",
+        "partial_parser_21",
+        "iter_parser_21",
+        "parse_page_21",
+    ),
+    "parser_22": (
+        "LINE_PATTERNS_22",
+        "MARKERS_22",
+        "parser_22",
+        "iter_parser_22",
+        "parse_page_22",
+    ),
+    "parser_23_non_poster": (
+        "LINE_PATTERNS_23_NON_POSTER",
+        "MARKERS_23_NON_POSTER",
+        "parser_23_non_poster",
+        "iter_parser_23_non_poster",
+        "parse_page_23_non_poster",
+    ),
+    "parser_23_poster": (
+        "LINE_PATTERNS_23_POSTER",
+        "parser_23_poster",
+        "iter_parser_23_poster",
+        "parse_page_23_poster",
+    ),
+}
+
+_MODULE_OF = {
+    name: module_name for module_name, names in PARSER_MODULES.items() for name in names
+}
+
+__all__ = list(_MODULE_OF)
+
+
+def __getattr__(name):
+    """
+    Imports the parser module exporting a name on first access (PEP 562).
+    """
+    if name not in _MODULE_OF:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name = _MODULE_OF[name]
+    module = importlib.import_module(f".{module_name}", __name__)
+    # The import system binds the parser module to the package under its own name, which would hide the parser
+    # function of the same name, e.g. parser_19, so every name of the module is bound over it
     globals().update(
-        {
-            name: getattr(module, name)
-            for name in dir(module)
-            if not name.startswith("_")
-        }
+        {name: getattr(module, name) for name in PARSER_MODULES[module_name]}
     )
+    return globals()[name]
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,5 +1,17 @@
 from ..utils import *
-import pandas as pd
+
+# Patterns classifying the lines of the 2019 abstract book, in order of precedence
+LINE_PATTERNS_19 = compile_line_patterns(
+    {
+        LineKind.SKIP: (r"View Session", r"Add to Schedule"),
+        LineKind.TITLE: r"PgmNr\s*(\d+):\s*(.*)",
+        LineKind.AUTHORS: r"Author[s]?:\s*(.*)",
+        LineKind.AFFILIATIONS: r"Affiliation[s]?:\s*(.*)",
+    }
+)
+
+# Markers of the abstract pages, found by the pre-pass classifying the pages
+MARKERS_19 = get_line_patterns(LINE_PATTERNS_19, [LineKind.TITLE])
 
 
 def parser_19(document):
@@ -24,81 +36,107 @@ def parser_19(document):
         - content: The main body or content of the abstract.
     """
 
-    data = []  # Initialize an empty list to store the parsed data
-
-    for page in document:  # Iterate over each page in the document
-        current_stage = None  # Initialize the current parsing stage
-        blocks = page.get_text("dict")["blocks"]  # Extract text blocks from the page
-        lines = get_lines_from_column(
-            blocks
-        )  # Get individual lines from the text blocks
-        last_line_bbox = None  # Track the bounding box of the last processed line
-
-        for line in lines:  # Iterate over each line in the page
-            content = get_text(line).replace(
-                "ﬃ", "ffi"
-            )  # Extract and clean the text content
-            current_line_bbox = line["bbox"]  # Get the bounding box of the current line
-
-            # Skip lines containing session or schedule information
-            if re.search(r"View Session|Add to Schedule", content):
-                continue
-
-            # Match and extract the abstract ID and title
-            title_match = re.search(r"PgmNr\s*(\d+):\s*(.*)", content)
-            # Match and extract the authors
-            authors_match = re.search(r"Author[s]?:\s*(.*)", content)
-            # Match and extract the affiliations
-            affiliations_match = re.search(r"Affiliation[s]?:\s*(.*)", content)
-
-            # If the line contains a title, start a new entry
-            if title_match:
-                current_stage = ParsingStage.TITLE  # Set the current stage to TITLE
-                data.append(
-                    dict(
-                        id=title_match.group(1),  # Extract the abstract ID
-                        title=title_match.group(2)
-                        + " ",  # Extract the title and append a space for continuation
-                        authors="",  # Initialize the authors field
-                        affiliations="",  # Initialize the affiliations field
-                        content="",  # Initialize the content field
-                    )
+    # Collect the finalized abstracts into a DataFrame
+    return records_to_frame(iter_parser_19(document))
+
+
+def iter_parser_19(document):
+    """
+    Parses a PDF document containing ASHG abstracts from 2019 one page at a time and yields each abstract as soon as the
+    page where the next abstract starts has been parsed.
+
+    Parameters:
+    -----------
+    document : list
+        A list where each element represents a page in the PDF document.
+
+    Yields:
+    -------
+    dict
+        An abstract with the id, title, authors, affiliations and content fields as strings.
+    """
+
+    yield from iter_records(document, None, get_sorted_page_lines, parse_page_19)
+
+
+def parse_page_19(state, page_content):
+    """
+    Parses the lines of a single page of the 2019 abstract book and updates the parsing state.
+    Entries carried over from previous pages are continued, so pages can be parsed one at a time.
+
+    Parameters:
+    -----------
+    state : dict
+        The parsing state, where 'data' holds the list of parsed data entries.
+    page_content : list of Line
+        The lines of the page, as returned by get_sorted_page_lines.
+
+    Returns:
+    --------
+    None
+    """
+
+    data = state["data"]  # List to store the parsed data
+    current_stage = None  # Initialize the current parsing stage
+    last_line_bbox = None  # Track the bounding box of the last processed line
+
+    for line in page_content:  # Iterate over each line in the page
+        content = get_text(line)  # Extract the text content of the line
+        current_line_bbox = line.bbox  # Get the bounding box of the current line
+
+        # Classify the line by the first pattern found in it
+        kind, match = classify_line(LINE_PATTERNS_19, content)
+
+        # Skip lines containing session or schedule information
+        if kind == LineKind.SKIP:
+            continue
+
+        # If the line contains a title, start a new entry
+        if kind == LineKind.TITLE:
+            current_stage = ParsingStage.TITLE  # Set the current stage to TITLE
+            data.append(
+                dict(
+                    id=match.group(1),  # Extract the abstract ID
+                    title=TextBuilder(
+                        match.group(2) + " "
+                    ),  # Extract the title and append a space for continuation
+                    authors=TextBuilder(),  # Initialize the authors field
+                    affiliations=TextBuilder(),  # Initialize the affiliations field
+                    content=TextBuilder(),  # Initialize the content field
                 )
-            # If the line contains authors, update the current entry with authors
-            elif authors_match:
-                current_stage = ParsingStage.AUTHORS  # Set the current stage to AUTHORS
-                data[-1].update(
-                    dict(authors=authors_match.group(1) + " ")
-                ) if authors_match.group(
-                    1
-                ) else None  # Append authors to the last entry
-            # If the line contains affiliations, update the current entry with affiliations
-            elif affiliations_match:
-                current_stage = (
-                    ParsingStage.AFFILIATIONS
-                )  # Set the current stage to AFFILIATIONS
-                last_line_bbox = current_line_bbox  # Update the last line bounding box
-                data[-1].update(
-                    dict(affiliations=affiliations_match.group(1) + " ")
-                ) if affiliations_match.group(
-                    1
-                ) else None  # Append affiliations to the last entry
-
-            # Skip to the next line if the current one matched any of the above categories
-            if title_match or authors_match or affiliations_match:
-                continue
-
-            # Determine if the current line belongs to the content section
-            current_stage = (
-                ParsingStage.CONTENT
-                if not current_stage
-                or last_line_bbox
-                and is_content_start_y(last_line_bbox, current_line_bbox, 45)
-                else current_stage
             )
-            # Update the content field of the last entry
-            data = update_data(data, current_stage, content) if data else data
+        # If the line contains authors, update the current entry with authors
+        elif kind == LineKind.AUTHORS:
+            current_stage = ParsingStage.AUTHORS  # Set the current stage to AUTHORS
+            (
+                data[-1].update(dict(authors=TextBuilder(match.group(1) + " ")))
+                if match.group(1)
+                else None
+            )  # Append authors to the last entry
+        # If the line contains affiliations, update the current entry with affiliations
+        elif kind == LineKind.AFFILIATIONS:
+            current_stage = (
+                ParsingStage.AFFILIATIONS
+            )  # Set the current stage to AFFILIATIONS
             last_line_bbox = current_line_bbox  # Update the last line bounding box
+            (
+                data[-1].update(dict(affiliations=TextBuilder(match.group(1) + " ")))
+                if match.group(1)
+                else None
+            )  # Append affiliations to the last entry
+
+        # Skip to the next line if the current one matched any of the above categories
+        if kind:
+            continue
 
-    # Convert the parsed data into a DataFrame and strip trailing whitespace from each field
-    return pd.DataFrame(data).astype(str).applymap(lambda x: x.rstrip())
+        # Determine if the current line belongs to the content section
+        current_stage = (
+            ParsingStage.CONTENT
+            if not current_stage
+            or last_line_bbox
+            and is_content_start_y(last_line_bbox, current_line_bbox, 45)
+            else current_stage
+        )
+        # Update the content field of the last entry
+        data = update_data(data, current_stage, content) if data else data
+        last_line_bbox = current_line_bbox  # Update the last line bounding box
@@ -1,5 +1,42 @@
+import re
 from ..utils import *
-import pandas as pd
+
+# Patterns of the headings of the sections of the 2021 abstract book, each parsed into a separate DataFrame:
+#   -- Plenary Sessions
+#   -- Platform Sessions
+#   -- Poster Talks
+#   -- Poster Presentations
+# The pages of each section are derived from the pages holding the headings, see classify_pages
+SECTION_HEADINGS_21 = {
+    "Plenary": re.compile(r"^\s*Plenary Sessions?\s*$"),
+    "Platform": re.compile(r"^\s*Platform Sessions?\s*$"),
+    "Talks": re.compile(r"^\s*Poster Talks?\s*$"),
+    "Presentations": re.compile(r"^\s*Poster Presentations?\s*$"),
+}
+
+# The ranges of pages of the sections, as previously hard-coded: pages 73-89, 90-295, 296-379 and 380-2225.
+# They are no longer used to parse the sections, only to warn when the derived pages differ from them, see
+# get_section_pages
+PAGE_RANGES_21 = [range(73, 89), range(90, 295), range(296, 379), range(380, 2224)]
+
+# The (suffix, heading, pages) of each section, as used by the parser registry
+SECTIONS_21 = [
+    (suffix, heading, pages)
+    for (suffix, heading), pages in zip(SECTION_HEADINGS_21.items(), PAGE_RANGES_21)
+]
+
+# Patterns classifying the lines of the 2021 abstract book, in order of precedence
+LINE_PATTERNS_21 = compile_line_patterns(
+    {
+        LineKind.SKIP: r"View session detail",
+        LineKind.TITLE: r"PrgmNr\s*(\d+)\s*-\s*(.*)",
+        LineKind.AUTHORS: r"Author Block:\s*(.*)",
+        LineKind.CONTENT: r"Disclosure Block:\s*(.*)",
+    }
+)
+
+# Markers of the abstract pages, found by the pre-pass classifying the pages
+MARKERS_21 = get_line_patterns(LINE_PATTERNS_21, [LineKind.TITLE])
 
 
 def parser_21(document):
@@ -7,7 +44,7 @@ def parser_21(document):
     Parses a PDF document containing ASHG (American Society of Human Genetics) abstracts from 2021.
     The function extracts and organizes key information such as the abstract ID, title, authors, and content.
 
-    The parsing process is divided into four chunks, and the function yields DataFrames for each chunk.
+    The document is divided into its four sections, and the function yields a DataFrame for each section.
 
     Parameters:
     -----------
@@ -18,7 +55,7 @@ def parser_21(document):
     Yields:
     -------
     pd.DataFrame
-        A DataFrame for each range of pages processed. Each row represents an individual abstract extracted
+        A DataFrame for each section of the document. Each row represents an individual abstract extracted
         from the document with the following columns:
         - id: A unique identifier for the abstract.
         - title: The title of the abstract.
@@ -26,96 +63,129 @@ def parser_21(document):
         - content: The main body or content of the abstract.
     """
 
-    def partial_parser(pages):
-        """
-        Processes a subset of pages from the document and extracts structured information (ID, title, authors, content).
-
-        Parameters:
-        -----------
-        pages : iterable
-            A sequence of pages to be processed.
-
-        Returns:
-        --------
-        pd.DataFrame
-            A DataFrame where each row represents an individual abstract extracted from the subset of pages with columns:
-            - id: A unique identifier for the abstract.
-            - title: The title of the abstract.
-            - authors: The authors associated with the abstract.
-            - content: The main body or content of the abstract.
-        """
-
-        data = []  # Initialize an empty list to store the parsed data
-
-        for page in pages:  # Iterate over each page in the provided subset
-            current_stage = None  # Initialize the current parsing stage
-            blocks = page.get_text("dict")[
-                "blocks"
-            ]  # Extract text blocks from the page
-            lines = get_lines_from_column(
-                blocks
-            )  # Get individual lines from the text blocks
-
-            for line in lines:  # Iterate over each line in the page
-                content = get_text(line)  # Extract the text content of the line
-
-                # Skip lines with specific font size or session details
-                if line["spans"][0]["size"] == 8 or re.search(
-                    "View session detail", content
-                ):
-                    continue
-
-                # Match and extract the abstract ID and title
-                title_match = re.search(r"PrgmNr\s*(\d+)\s*-\s*(.*)", content)
-                # Match and extract the authors
-                authors_match = re.search(r"Author Block:\s*(.*)", content)
-                # Match and extract the content block
-                content_match = re.search(r"Disclosure Block:\s*(.*)", content)
-
-                # If the line contains a title, start a new entry
-                if title_match:
-                    current_stage = ParsingStage.TITLE  # Set the current stage to TITLE
-                    data.append(
-                        dict(
-                            id=title_match.group(1),  # Extract the abstract ID
-                            title=title_match.group(2)
-                            + " ",  # Extract the title and append a space for continuation
-                            authors="",  # Initialize the authors field
-                            content="",  # Initialize the content field
-                        )
-                    )
-                # If the line contains authors, update the current entry with authors
-                elif authors_match:
-                    current_stage = (
-                        ParsingStage.AUTHORS
-                    )  # Set the current stage to AUTHORS
-                    data[-1].update(
-                        dict(authors=authors_match.group(1) + " ")
-                    )  # Append authors to the last entry
-                # If the line contains content, update the current entry with content
-                elif not current_stage or content_match:
-                    current_stage = (
-                        ParsingStage.CONTENT
-                    )  # Set the current stage to CONTENT
-                    data[-1].update(
-                        dict(content=content_match.group(1) + " ")
-                    ) if content_match else None  # Append content to the last entry
-
-                # Skip to the next line if the current one matched any of the above categories
-                if title_match or authors_match or content_match or not current_stage:
-                    continue
-
-                # Update the content field of the last entry
-                data = update_data(data, current_stage, content) if data else data
-
-        # Convert the parsed data into a DataFrame and strip trailing whitespace from each field
-        return pd.DataFrame(data).astype(str).applymap(lambda x: x.rstrip())
-
-    # Define the ranges of pages to process in chunks and yield the result of partial parsing for each chunk
-    # The chunks correspond to different sections of the ASHG 2021 abstracts:
-    #   -- Plenary Sessions: pages 73-89
-    #   -- Platform Sessions: pages 90-295
-    #   -- Poster Talks: pages 296-379
-    #   -- Poster Presentations: pages 380-2225
-    for pages in [range(73, 89), range(90, 295), range(296, 379), range(380, 2224)]:
-        yield partial_parser(map(document.__getitem__, pages))
+    # Derive the pages of each section from a cheap pre-pass over the text of the pages
+    page_kinds = classify_pages(
+        document, MARKERS_21, list(SECTION_HEADINGS_21.values())
+    )
+
+    # Yield the result of partial parsing for each section
+    for pages in get_section_pages(
+        page_kinds, len(SECTION_HEADINGS_21), PAGE_RANGES_21
+    ):
+        yield partial_parser_21(document, pages)
+
+
+def partial_parser_21(document, pages):
+    """
+    Processes a subset of pages from the document and extracts structured information (ID, title, authors, content).
+
+    Parameters:
+    -----------
+    document : list
+        A list where each element represents a page in the PDF document.
+    pages : iterable of int
+        The indices of the pages to be processed.
+
+    Returns:
+    --------
+    pd.DataFrame
+        A DataFrame where each row represents an individual abstract extracted from the subset of pages with columns:
+        - id: A unique identifier for the abstract.
+        - title: The title of the abstract.
+        - authors: The authors associated with the abstract.
+        - content: The main body or content of the abstract.
+    """
+
+    # Collect the finalized abstracts into a DataFrame
+    return records_to_frame(iter_parser_21(document, pages))
+
+
+def iter_parser_21(document, pages):
+    """
+    Parses a subset of pages from the 2021 document one page at a time and yields each abstract as soon as the
+    page where the next abstract starts has been parsed.
+
+    Parameters:
+    -----------
+    document : list
+        A list where each element represents a page in the PDF document.
+    pages : iterable of int
+        The indices of the pages to be processed.
+
+    Yields:
+    -------
+    dict
+        An abstract with the id, title, authors and content fields as strings.
+    """
+
+    yield from iter_records(document, pages, get_page_lines, parse_page_21)
+
+
+def parse_page_21(state, page_content):
+    """
+    Parses the lines of a single page of the 2021 abstract book and updates the parsing state.
+    Entries carried over from previous pages are continued, so pages can be parsed one at a time or in shards.
+
+    Parameters:
+    -----------
+    state : dict
+        The parsing state, where 'data' holds the list of parsed data entries.
+    page_content : list of Line
+        The lines of the page, as returned by get_page_lines.
+
+    Returns:
+    --------
+    None
+    """
+
+    data = state["data"]  # List to store the parsed data
+    current_stage = None  # Initialize the current parsing stage
+
+    for line in page_content:  # Iterate over each line in the page
+        content = get_text(line)  # Extract the text content of the line
+
+        # Skip lines with specific font size
+        if line.spans[0].size == 8:
+            continue
+
+        # Classify the line by the first pattern found in it
+        kind, match = classify_line(LINE_PATTERNS_21, content)
+
+        # Skip lines with session details
+        if kind == LineKind.SKIP:
+            continue
+
+        # If the line contains a title, start a new entry
+        if kind == LineKind.TITLE:
+            current_stage = ParsingStage.TITLE  # Set the current stage to TITLE
+            data.append(
+                dict(
+                    id=match.group(1),  # Extract the abstract ID
+                    title=TextBuilder(
+                        match.group(2) + " "
+                    ),  # Extract the title and append a space for continuation
+                    authors=TextBuilder(),  # Initialize the authors field
+                    content=TextBuilder(),  # Initialize the content field
+                )
+            )
+        # If the line contains authors, update the current entry with authors
+        elif kind == LineKind.AUTHORS:
+            current_stage = ParsingStage.AUTHORS  # Set the current stage to AUTHORS
+            data[-1].update(
+                dict(authors=TextBuilder(match.group(1) + " "))
+            )  # Append authors to the last entry
+        # If the line contains content, update the current entry with content
+        elif not current_stage or kind == LineKind.CONTENT:
+            current_stage = ParsingStage.CONTENT  # Set the current stage to CONTENT
+            (
+                data[-1].update(dict(content=TextBuilder(match.group(1) + " ")))
+                if kind == LineKind.CONTENT
+                else None
+            )  # Append content to the last entry
+
+        # Skip to the next line if the current one matched any of the above categories
+        if kind or not current_stage:
+            continue
+
+        # Update the content field of the last entry
+        data = update_data(data, current_stage, content) if data else data
@@ -1,5 +1,24 @@
 from ..utils import *
-import pandas as pd
+
+# Patterns classifying the lines of the 2022 abstract books, in order of precedence
+LINE_PATTERNS_22 = compile_line_patterns(
+    {
+        LineKind.SKIP: (
+            r"ASHG 2022 Annual Meeting .+ Abstracts",
+            r"Page\s+(\d+)\s+of\s+(\d+)",
+            r"^(Location|Session Time)",
+        ),
+        # Poster topics are anchored at the start of the line, where an unanchored search would find them as well,
+        # so that the greedy group is not retried from every position of lines without a topic
+        LineKind.TOPIC: r"S\d{2}\.\s*(.+)|^(.+) Posters\s*-\s*(?:Wednesday|Thursday)",
+        LineKind.TITLE: r"(?:ProgNbr|PB)\s*(\d+)\*?[:.]\s*(.+)",
+        LineKind.AUTHORS: r"Authors:\s*(.*)",
+        LineKind.CONTENT: r"Abstract(?: Body)?:\s*(.*)",
+    }
+)
+
+# Markers of the abstract pages, found by the pre-pass classifying the pages
+MARKERS_22 = get_line_patterns(LINE_PATTERNS_22, [LineKind.TOPIC, LineKind.TITLE])
 
 
 def parser_22(document):
@@ -24,87 +43,101 @@ def parser_22(document):
         - header: The topic or session header associated with the abstract.
     """
 
-    data = []  # Initialize an empty list to store the parsed data
+    # Collect the finalized abstracts into a DataFrame
+    return records_to_frame(iter_parser_22(document))
 
-    for page in document:  # Iterate over each page in the document
-        current_stage = None  # Initialize the current parsing stage
-        blocks = page.get_text("dict")["blocks"]  # Extract text blocks from the page
-        lines = get_lines_from_column(
-            blocks
-        )  # Get individual lines from the text blocks
 
-        for line in lines:  # Iterate over each line in the page
-            content = get_text(line)  # Extract the text content of the line
+def iter_parser_22(document):
+    """
+    Parses a PDF document containing ASHG abstracts from 2022 one page at a time and yields each abstract as soon as the
+    page where the next abstract starts has been parsed.
 
-            # Skip lines that contain certain metadata or session information
-            if re.search(
-                r"ASHG 2022 Annual Meeting .+ Abstracts|Page\s+(\d+)\s+of\s+(\d+)|^(Location|Session Time)",
-                content,
-            ):
-                continue
+    Parameters:
+    -----------
+    document : list
+        A list where each element represents a page in the PDF document.
 
-            # Match and extract the session or topic header
-            topic_match = re.search(
-                r"S\d{2}\.\s*(.+)|(.+) Posters\s*-\s*(?:Wednesday|Thursday)", content
-            )
-            # Match and extract the abstract ID and title
-            title_match = re.search(r"(?:ProgNbr|PB)\s*(\d+)\*?[:.]\s*(.+)", content)
-            # Match and extract the authors
-            authors_match = re.search(r"Authors:\s*(.*)", content)
-            # Match and extract the abstract content
-            content_match = re.search(r"Abstract(?: Body)?:\s*(.*)", content)
-
-            # If the line contains a topic or session header, start a new entry
-            if topic_match:
-                data.append(
-                    dict(
-                        id="",  # Initialize the ID field
-                        title="",  # Initialize the title field
-                        authors="",  # Initialize the authors field
-                        content="",  # Initialize the content field
-                        header=topic_match.group(1)
-                        or topic_match.group(2),  # Extract the header
-                    )
+    Yields:
+    -------
+    dict
+        An abstract with the id, title, authors, content and header fields as strings.
+    """
+
+    yield from iter_records(document, None, get_page_lines, parse_page_22)
+
+
+def parse_page_22(state, page_content):
+    """
+    Parses the lines of a single page of a 2022 abstract book and updates the parsing state.
+    Entries carried over from previous pages are continued, so pages can be parsed one at a time.
+
+    Parameters:
+    -----------
+    state : dict
+        The parsing state, where 'data' holds the list of parsed data entries.
+    page_content : list of Line
+        The lines of the page, as returned by get_page_lines.
+
+    Returns:
+    --------
+    None
+    """
+
+    data = state["data"]  # List to store the parsed data
+    current_stage = None  # Initialize the current parsing stage
+
+    for line in page_content:  # Iterate over each line in the page
+        content = get_text(line)  # Extract the text content of the line
+
+        # Classify the line by the first pattern found in it
+        kind, match = classify_line(LINE_PATTERNS_22, content)
+
+        # Skip lines that contain certain metadata or session information
+        if kind == LineKind.SKIP:
+            continue
+
+        # If the line contains a topic or session header, start a new entry
+        if kind == LineKind.TOPIC:
+            data.append(
+                dict(
+                    id="",  # Initialize the ID field
+                    title=TextBuilder(),  # Initialize the title field
+                    authors=TextBuilder(),  # Initialize the authors field
+                    content=TextBuilder(),  # Initialize the content field
+                    header=match.group(1) or match.group(2),  # Extract the header
                 )
-            # If the line contains a title, update the current entry with the ID and title
-            elif data and title_match:
-                current_stage = ParsingStage.TITLE  # Set the current stage to TITLE
-                data[-1].update(
-                    dict(
-                        id=title_match.group(1),  # Extract the abstract ID
-                        title=title_match.group(2)
-                        + " ",  # Extract the title and append a space for continuation
-                    )
+            )
+        # If the line contains a title, update the current entry with the ID and title
+        elif data and kind == LineKind.TITLE:
+            current_stage = ParsingStage.TITLE  # Set the current stage to TITLE
+            data[-1].update(
+                dict(
+                    id=match.group(1),  # Extract the abstract ID
+                    title=TextBuilder(
+                        match.group(2) + " "
+                    ),  # Extract the title and append a space for continuation
                 )
-            # If the line contains authors, update the current entry with authors
-            elif authors_match:
-                current_stage = ParsingStage.AUTHORS  # Set the current stage to AUTHORS
-                data[-1].update(
-                    dict(authors=authors_match.group(1) + " ")
-                ) if authors_match.group(
-                    1
-                ) else None  # Append authors to the last entry
-            # If the line contains content, update the current entry with content
-            elif not current_stage or content_match:
-                current_stage = ParsingStage.CONTENT  # Set the current stage to CONTENT
-                data[-1].update(
-                    dict(content=content_match.group(1) + " ")
-                ) if content_match and content_match.group(
-                    1
-                ) else None  # Append content to the last entry
-
-            # Skip to the next line if the current one matched any of the above categories
-            if (
-                topic_match
-                or title_match
-                or authors_match
-                or content_match
-                or not current_stage
-            ):
-                continue
-
-            # Update the content field of the last entry with any remaining text
-            data = update_data(data, current_stage, content) if data else data
-
-    # Convert the parsed data into a DataFrame and strip trailing whitespace from each field
-    return pd.DataFrame(data).astype(str).applymap(lambda x: x.rstrip())
+            )
+        # If the line contains authors, update the current entry with authors
+        elif kind == LineKind.AUTHORS:
+            current_stage = ParsingStage.AUTHORS  # Set the current stage to AUTHORS
+            (
+                data[-1].update(dict(authors=TextBuilder(match.group(1) + " ")))
+                if match.group(1)
+                else None
+            )  # Append authors to the last entry
+        # If the line contains content, update the current entry with content
+        elif not current_stage or kind == LineKind.CONTENT:
+            current_stage = ParsingStage.CONTENT  # Set the current stage to CONTENT
+            (
+                data[-1].update(dict(content=TextBuilder(match.group(1) + " ")))
+                if kind == LineKind.CONTENT and match.group(1)
+                else None
+            )  # Append content to the last entry
+
+        # Skip to the next line if the current one matched any of the above categories
+        if kind or not current_stage:
+            continue
+
+        # Update the content field of the last entry with any remaining text
+        data = update_data(data, current_stage, content) if data else data
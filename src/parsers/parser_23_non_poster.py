@@ -1,5 +1,23 @@
 from ..utils import *
-import pandas as pd
+
+# Patterns classifying the lines of the 2023 abstract books, in order of precedence
+LINE_PATTERNS_23_NON_POSTER = compile_line_patterns(
+    {
+        LineKind.SKIP: (
+            r"ASHG 2023 Annual Meeting .+ Abstracts",
+            r"^(Location|Session Time)",
+        ),
+        LineKind.TOPIC: r"Session \d{3}:\s*(.+)",
+        LineKind.TITLE: r"Title:\s*(.+)",
+        LineKind.AUTHORS: r"Authors:\s*(.*)",
+        LineKind.CONTENT: r"Abstract(?: Body)?:\s*(.*)",
+    }
+)
+
+# Markers of the abstract pages, found by the pre-pass classifying the pages
+MARKERS_23_NON_POSTER = get_line_patterns(
+    LINE_PATTERNS_23_NON_POSTER, [LineKind.TOPIC, LineKind.TITLE]
+)
 
 
 def parser_23_non_poster(document):
@@ -23,79 +41,110 @@ def parser_23_non_poster(document):
         - header: The session header or topic associated with the abstract.
     """
 
-    data = []  # Initialize an empty list to store the parsed data
-    header = ""  # Initialize the header for each session or topic
-
-    for page in document:  # Iterate over each page in the document
-        current_stage = None  # Initialize the current parsing stage
-        blocks = page.get_text("dict")["blocks"]  # Extract text blocks from the page
-        lines = get_lines_from_column(
-            blocks
-        )  # Get individual lines from the text blocks
-
-        for line in lines:  # Iterate over each line in the page
-            content = get_text(line)  # Extract the text content of the line
-
-            # Skip lines that contain certain metadata or session information
-            if re.search(
-                r"ASHG 2023 Annual Meeting .+ Abstracts|^(Location|Session Time)",
-                content,
-            ):
-                continue
-
-            # Match and extract the session or topic header
-            topic_match = re.search(r"Session \d{3}:\s*(.+)", content)
-            # Match and extract the title of the abstract
-            title_match = re.search(r"Title:\s*(.+)", content)
-            # Match and extract the authors
-            authors_match = re.search(r"Authors:\s*(.*)", content)
-            # Match and extract the abstract content
-            content_match = re.search(r"Abstract(?: Body)?:\s*(.*)", content)
-
-            # If the line contains a topic or session header, update the current header
-            if topic_match:
-                header = topic_match.group(1)
-            # If the line contains a title, start a new entry
-            elif title_match:
-                # If the last entry does not have both authors and content, remove it (incomplete entry)
-                data.pop() if data and not (
-                    data[-1]["authors"] and data[-1]["content"]
-                ) else None
-                current_stage = ParsingStage.TITLE  # Set the current stage to TITLE
-                data.append(
-                    dict(
-                        title=title_match.group(1)
-                        + " ",  # Extract the title and append a space for continuation
-                        authors="",  # Initialize the authors field
-                        content="",  # Initialize the content field
-                        header=header,  # Use the current session header
-                    )
+    # Collect the finalized abstracts into a DataFrame
+    return records_to_frame(iter_parser_23_non_poster(document))
+
+
+def iter_parser_23_non_poster(document):
+    """
+    Parses a PDF document containing ASHG 2023 abstracts one page at a time and yields each abstract as soon as the
+    page where the next abstract starts has been parsed.
+
+    Parameters:
+    -----------
+    document : list
+        A list where each element represents a page in the PDF document.
+
+    Yields:
+    -------
+    dict
+        An abstract with the title, authors, content and header fields as strings.
+    """
+
+    yield from iter_records(
+        document,
+        None,
+        get_page_lines,
+        parse_page_23_non_poster,
+        dict(data=[], header=""),
+    )
+
+
+def parse_page_23_non_poster(state, page_content):
+    """
+    Parses the lines of a single page of a 2023 abstract book and updates the parsing state.
+    Entries carried over from previous pages are continued, so pages can be parsed one at a time.
+
+    Parameters:
+    -----------
+    state : dict
+        The parsing state, where 'data' holds the list of parsed data entries and 'header' the current session header.
+    page_content : list of Line
+        The lines of the page, as returned by get_page_lines.
+
+    Returns:
+    --------
+    None
+    """
+
+    data = state["data"]  # List to store the parsed data
+    current_stage = None  # Initialize the current parsing stage
+    header = state["header"]  # Continue with the session header of the previous page
+
+    for line in page_content:  # Iterate over each line in the page
+        content = get_text(line)  # Extract the text content of the line
+
+        # Classify the line by the first pattern found in it
+        kind, match = classify_line(LINE_PATTERNS_23_NON_POSTER, content)
+
+        # Skip lines that contain certain metadata or session information
+        if kind == LineKind.SKIP:
+            continue
+
+        # If the line contains a topic or session header, update the current header
+        if kind == LineKind.TOPIC:
+            header = match.group(1)
+        # If the line contains a title, start a new entry
+        elif kind == LineKind.TITLE:
+            # If the last entry does not have both authors and content, remove it (incomplete entry)
+            (
+                data.pop()
+                if data and not (data[-1]["authors"] and data[-1]["content"])
+                else None
+            )
+            current_stage = ParsingStage.TITLE  # Set the current stage to TITLE
+            data.append(
+                dict(
+                    title=TextBuilder(
+                        match.group(1) + " "
+                    ),  # Extract the title and append a space for continuation
+                    authors=TextBuilder(),  # Initialize the authors field
+                    content=TextBuilder(),  # Initialize the content field
+                    header=header,  # Use the current session header
                 )
-            # If the line contains authors, update the current entry with authors
-            elif authors_match:
-                current_stage = ParsingStage.AUTHORS  # Set the current stage to AUTHORS
-                data[-1].update(
-                    dict(authors=authors_match.group(1) + " ")
-                ) if authors_match.group(1) else None
-            # If the line contains content, update the current entry with content
-            elif not current_stage or content_match:
-                current_stage = ParsingStage.CONTENT  # Set the current stage to CONTENT
-                data[-1].update(
-                    dict(content=content_match.group(1) + " ")
-                ) if content_match and content_match.group(1) else None
-
-            # Skip to the next line if the current one matched any of the above categories
-            if (
-                topic_match
-                or title_match
-                or authors_match
-                or content_match
-                or not current_stage
-            ):
-                continue
-
-            # Update the content field of the last entry with any remaining text
-            data = update_data(data, current_stage, content) if data else data
-
-    # Convert the parsed data into a DataFrame and strip trailing whitespace from each field
-    return pd.DataFrame(data).astype(str).applymap(lambda x: x.rstrip())
+            )
+        # If the line contains authors, update the current entry with authors
+        elif kind == LineKind.AUTHORS:
+            current_stage = ParsingStage.AUTHORS  # Set the current stage to AUTHORS
+            (
+                data[-1].update(dict(authors=TextBuilder(match.group(1) + " ")))
+                if match.group(1)
+                else None
+            )
+        # If the line contains content, update the current entry with content
+        elif not current_stage or kind == LineKind.CONTENT:
+            current_stage = ParsingStage.CONTENT  # Set the current stage to CONTENT
+            (
+                data[-1].update(dict(content=TextBuilder(match.group(1) + " ")))
+                if kind == LineKind.CONTENT and match.group(1)
+                else None
+            )
+
+        # Skip to the next line if the current one matched any of the above categories
+        if kind or not current_stage:
+            continue
+
+        # Update the content field of the last entry with any remaining text
+        data = update_data(data, current_stage, content) if data else data
+
+    state["header"] = header  # Carry the session header over to the next page
@@ -1,5 +1,17 @@
 from ..utils import *
-import pandas as pd
+
+# Patterns classifying the lines of the 2023 poster abstract book, in order of precedence
+LINE_PATTERNS_23_POSTER = compile_line_patterns(
+    {
+        LineKind.SKIP: (
+            r"ASHG 2023 Annual Meeting .+ Abstracts",
+            r"Page\s+(\d+)\s+of\s+(\d+)",
+        ),
+        LineKind.TOPIC: r"Session Title:\s*(.+)\s*Poster Session\.*",
+        LineKind.TITLE: r"PB\s*(\d{4})\s*†?\s*(.+)",
+        LineKind.AUTHORS: r"Authors:\s*(.*)",
+    }
+)
 
 
 def parser_23_poster(document):
@@ -24,78 +36,114 @@ def parser_23_poster(document):
         - header: The session header or topic associated with the abstract.
     """
 
-    data = []  # Initialize an empty list to store the parsed data
-    last_line_bbox = None  # Initialize the bounding box of the last processed line
-
-    for page in document:  # Iterate over each page in the document
-        current_stage = None  # Initialize the current parsing stage
-        blocks = page.get_text("dict")["blocks"]  # Extract text blocks from the page
-        lines = get_lines_from_column(
-            blocks
-        )  # Get individual lines from the text blocks
-
-        for line in lines:  # Iterate over each line in the page
-            content = get_text(line)  # Extract the text content of the line
-            current_line_bbox = line[
-                "bbox"
-            ]  # Get the bounding box for the current line
-
-            # Skip lines that contain metadata or page numbers
-            if re.search(
-                r"ASHG 2023 Annual Meeting .+ Abstracts|Page\s+(\d+)\s+of\s+(\d+)",
-                content,
-            ):
-                continue
-
-            # Match and extract the session or topic header for posters
-            topic_match = re.search(
-                r"Session Title:\s*(.+)\s*Poster Session\.*", content
-            )
-            # Match and extract the poster ID and title
-            title_match = re.search(r"PB\s*(\d{4})\s*†?\s*(.+)", content)
-            # Match and extract the authors associated with the poster
-            authors_match = re.search(r"Authors:\s*(.*)", content)
-
-            # If the line contains a topic or session header, start a new entry with the header
-            if topic_match:
-                data.append(
-                    dict(
-                        id="",
-                        title="",
-                        authors="",
-                        content="",
-                        header=topic_match.group(1),
-                    )
+    # Collect the finalized abstracts into a DataFrame
+    return records_to_frame(iter_parser_23_poster(document))
+
+
+def iter_parser_23_poster(document):
+    """
+    Parses a PDF document containing ASHG 2023 poster session abstracts one page at a time and yields each
+    abstract as soon as the page where the next abstract starts has been parsed.
+
+    Parameters:
+    -----------
+    document : list
+        A list where each element represents a page in the PDF document.
+
+    Yields:
+    -------
+    dict
+        An abstract with the id, title, authors, content and header fields as strings.
+    """
+
+    yield from iter_records(
+        document,
+        None,
+        get_page_lines,
+        parse_page_23_poster,
+        dict(data=[], last_line_bbox=None),
+    )
+
+
+def parse_page_23_poster(state, page_content):
+    """
+    Parses the lines of a single page of the 2023 poster abstract book and updates the parsing state.
+    Entries carried over from previous pages are continued, so pages can be parsed one at a time.
+
+    Parameters:
+    -----------
+    state : dict
+        The parsing state, where 'data' holds the list of parsed data entries and 'last_line_bbox' the bounding
+        box of the last processed line.
+    page_content : list of Line
+        The lines of the page, as returned by get_page_lines.
+
+    Returns:
+    --------
+    None
+    """
+
+    data = state["data"]  # List to store the parsed data
+    current_stage = None  # Initialize the current parsing stage
+    # Continue from the last line of the previous page
+    last_line_bbox = state["last_line_bbox"]
+
+    for line in page_content:  # Iterate over each line in the page
+        content = get_text(line)  # Extract the text content of the line
+        current_line_bbox = line.bbox  # Get the bounding box for the current line
+
+        # Classify the line by the first pattern found in it
+        kind, match = classify_line(LINE_PATTERNS_23_POSTER, content)
+
+        # Skip lines that contain metadata or page numbers
+        if kind == LineKind.SKIP:
+            continue
+
+        # If the line contains a topic or session header, start a new entry with the header
+        if kind == LineKind.TOPIC:
+            data.append(
+                dict(
+                    id="",
+                    title=TextBuilder(),
+                    authors=TextBuilder(),
+                    content=TextBuilder(),
+                    header=match.group(1),
                 )
-            # If the line contains a title, update the last entry with the ID and title
-            elif data and title_match:
-                current_stage = ParsingStage.TITLE  # Set the current stage to TITLE
-                data[-1].update(
-                    dict(id=title_match.group(1), title=title_match.group(2) + " ")
+            )
+        # If the line contains a title, update the last entry with the ID and title
+        elif data and kind == LineKind.TITLE:
+            current_stage = ParsingStage.TITLE  # Set the current stage to TITLE
+            data[-1].update(
+                dict(
+                    id=match.group(1),
+                    title=TextBuilder(match.group(2) + " "),
                 )
-            # If the line contains authors, update the current entry with the authors
-            elif authors_match:
-                current_stage = ParsingStage.AUTHORS  # Set the current stage to AUTHORS
-                data[-1].update(
-                    dict(authors=authors_match.group(1) + " ")
-                ) if authors_match.group(1) else None
-
-            # Skip to the next line if the current one matched any of the above categories
-            if topic_match or title_match or authors_match:
-                continue
-
-            # Determine if the current line should be considered part of the content
-            current_stage = (
-                ParsingStage.CONTENT
-                if not current_stage
-                or data
-                and data[-1]["authors"]
-                and is_content_start_y(last_line_bbox, current_line_bbox, 20)
-                else current_stage
             )
-            # Update the content field of the last entry with any remaining text
-            data = update_data(data, current_stage, content) if data else data
-            last_line_bbox = current_line_bbox  # Update the last line's bounding box for the next iteration
+        # If the line contains authors, update the current entry with the authors
+        elif kind == LineKind.AUTHORS:
+            current_stage = ParsingStage.AUTHORS  # Set the current stage to AUTHORS
+            (
+                data[-1].update(dict(authors=TextBuilder(match.group(1) + " ")))
+                if match.group(1)
+                else None
+            )
+
+        # Skip to the next line if the current one matched any of the above categories
+        if kind:
+            continue
+
+        # Determine if the current line should be considered part of the content
+        current_stage = (
+            ParsingStage.CONTENT
+            if not current_stage
+            or data
+            and data[-1]["authors"]
+            and is_content_start_y(last_line_bbox, current_line_bbox, 20)
+            else current_stage
+        )
+        # Update the content field of the last entry with any remaining text
+        data = update_data(data, current_stage, content) if data else data
+        last_line_bbox = current_line_bbox  # Update the last line's bounding box for the next iteration
 
-    # Convert the parsed data into a DataFrame and strip trailing whitespace from each field
-    return pd.DataFrame(data).astype(str).applymap(lambda x: x.rstrip())
+    # Carry the last line over to the next page
+    state["last_line_bbox"] = last_line_bbox
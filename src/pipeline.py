@@ -0,0 +1,101 @@
+import queue
+import threading
+from collections import deque
+
+# Sentinel closing the queue of a WriteBehind stage
+_DONE = object()
+
+
+def prefetch(submit, items, depth):
+    """
+    Submits the items to a producer stage ahead of the consumer and yields them with their futures in order. At
+    most depth items are submitted ahead of the item being consumed, so the stages overlap while the results held
+    between them stay bounded.
+
+    Parameters:
+    -----------
+    submit : callable
+        A function submitting an item to the producer stage, e.g. to an executor, and returning its future.
+    items : iterable
+        The items to be submitted, in the order they are consumed.
+    depth : int
+        The maximum number of items submitted ahead of the item being consumed.
+
+    Yields:
+    -------
+    tuple
+        An (item, future) pair for each item, in order.
+    """
+    pending = deque()
+    for item in items:
+        pending.append((item, submit(item)))
+        if len(pending) > depth:
+            yield pending.popleft()
+    while pending:
+        yield pending.popleft()
+
+
+class WriteBehind:
+    """
+    A consumer stage running in a background thread, fed through a bounded queue. Putting an item blocks while the
+    queue is full, so a producer faster than the consumer is held back instead of piling up results in memory.
+    The first error raised by the consumer is re-raised in the producer on the next put or on close.
+
+    Attributes:
+    -----------
+    consume : callable
+        The function called with each item, in the order the items were put.
+    queue : queue.Queue
+        The bounded queue of items waiting to be consumed.
+    error : BaseException or None
+        The first error raised by the consumer, if any.
+    """
+
+    def __init__(self, consume, maxsize):
+        self.consume = consume
+        self.queue = queue.Queue(maxsize)
+        self.error = None
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        """
+        Consumes the items of the queue until it is closed. Items put after an error are drained without being
+        consumed, so the producer is never blocked.
+        """
+        while (item := self.queue.get()) is not _DONE:
+            if self.error is None:
+                try:
+                    self.consume(item)
+                except BaseException as error:
+                    self.error = error
+
+    def put(self, item):
+        """
+        Queues an item to be consumed, blocking while the queue is full.
+        """
+        if self.error is not None:
+            raise self.error
+        self.queue.put(item)
+
+    def close(self):
+        """
+        Waits until every queued item is consumed and stops the thread.
+        """
+        self.queue.put(_DONE)
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            # Stop the thread without raising the consumer's error over the producer's
+            self.error = self.error or exc_value
+            self.queue.put(_DONE)
+            self.thread.join()
+        return False
@@ -0,0 +1,342 @@
+import os
+import re
+from collections import namedtuple
+from .cache import hash_sources, get_cache_key, load_from_cache, save_to_cache
+from .layout import LayoutDocument
+from .utils import (
+    get_page_lines,
+    get_sorted_page_lines,
+    get_lines_from_page,
+    IdRangeIndex,
+    classify_pages,
+    get_section_pages,
+)
+from .dicts import (
+    po2015_1885W,
+    po2015_3108T,
+    po2015_3034T,
+    po2015_3070T,
+    pl2015_168,
+    po2022_1537,
+    topic_mapping_2019,
+)
+from . import parsers
+
+
+class ParserSpec(
+    namedtuple(
+        "ParserSpec",
+        [
+            "read_page",
+            "parse_page",
+            "markers",
+            "state",
+            "sections",
+            "overrides",
+            "post_process",
+            "shardable",
+        ],
+        defaults=[None, {}, [(None, None, None)], [], [], False],
+    )
+):
+    """
+    Describes how the abstract book of a year is parsed and post-processed.
+
+    The parse_page, markers and sections fields may hold the name of an attribute of the parsers package, which is
+    resolved when the field is first accessed, so that only the parser module of the abstract book being parsed is
+    imported.
+
+    Attributes:
+    -----------
+    read_page : callable
+        The function extracting the content the parser consumes from a page.
+    parse_page : callable or str
+        The page-level parser updating the parsing state with the content of a page.
+    markers : list of re.Pattern or str
+        The patterns of the lines of the abstract pages, e.g. the lines starting an abstract, found by a cheap
+        pre-pass over the text of the pages to skip the front matter. If None, every page is parsed.
+    state : dict
+        The fields of the parsing state carried across pages, besides the 'data' list, with their initial values.
+    sections : list of tuple or str
+        The (suffix, heading, pages) of each section parsed into a separate CSV file. The suffix is appended to
+        the name of the PDF file, and the pages of the section are derived from the page holding the heading
+        pattern. A section with a None heading covers the whole document. If pages is not None, it is the range
+        of pages the section is expected to cover, and a warning is logged if the derived pages do not match.
+    overrides : list of dict
+        Data entries replacing the parsed entries with the same ID, for abstracts that cannot be parsed.
+    post_process : list of callable
+        Functions applied in order to the DataFrame of each section, each returning the updated DataFrame.
+    shardable : bool
+        Whether the page-level parser can parse page-range shards that are stitched together.
+    """
+
+    __slots__ = ()
+
+    @property
+    def parse_page(self):
+        return resolve_parser_name(super().parse_page)
+
+    @property
+    def markers(self):
+        return resolve_parser_name(super().markers)
+
+    @property
+    def sections(self):
+        return resolve_parser_name(super().sections)
+
+    def new_state(self):
+        """
+        Returns a new parsing state to parse a section from its first page.
+        """
+        return dict(data=[], **self.state)
+
+
+def resolve_parser_name(value):
+    """
+    Resolves the name of an attribute of the parsers package, which imports the parser module defining it on first
+    use. Values other than names are returned as is.
+
+    Parameters:
+    -----------
+    value : str or object
+        The name of an attribute of the parsers package, or the value itself.
+
+    Returns:
+    --------
+    object
+        The value of the attribute.
+    """
+    return getattr(parsers, value) if isinstance(value, str) else value
+
+
+# A section of a PDF file that is parsed into its own CSV file, and the unit of work dispatched to workers
+WorkUnit = namedtuple("WorkUnit", ["filename", "year", "poster", "name", "section"])
+
+
+def assign_topics_2019(df):
+    """
+    Sets the header of the 2019 posters to the topic of the range of abstract numbers they fall in.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        The parsed abstracts, with an 'id' column.
+
+    Returns:
+    --------
+    pd.DataFrame
+        The abstracts with the 'header' column set.
+    """
+    df["header"] = IdRangeIndex(topic_mapping_2019).lookup(df["id"])
+    return df
+
+
+# Abstract IDs of the 2013 to 2018 layout are lines of their own, e.g. 12 or 2258W, which the plain text of a
+# page cannot tell apart from page numbers, so the abstract pages are told apart by their running header
+SPEC_13_TO_18 = ParserSpec(
+    get_lines_from_page, "parse_page_13_to_18", "MARKERS_13_TO_18", shardable=True
+)
+# The lines of the 2019 pages are sorted by position before they are merged, which leaves the parsed abstracts of
+# the 2019 book unchanged. The other layouts are read in extraction order, which sorting changes
+SPEC_19 = ParserSpec(get_sorted_page_lines, "parse_page_19", "MARKERS_19")
+SPEC_21 = ParserSpec(
+    get_page_lines,
+    "parse_page_21",
+    "MARKERS_21",
+    sections="SECTIONS_21",
+    shardable=True,
+)
+SPEC_22 = ParserSpec(get_page_lines, "parse_page_22", "MARKERS_22")
+
+# The parser of the abstract books of each (year, poster) pair
+PARSER_REGISTRY = {
+    ("2013", False): SPEC_13_TO_18,
+    ("2013", True): SPEC_13_TO_18,
+    ("2014", False): SPEC_13_TO_18,
+    ("2014", True): SPEC_13_TO_18,
+    ("2015", False): SPEC_13_TO_18._replace(overrides=[pl2015_168]),
+    ("2015", True): SPEC_13_TO_18._replace(
+        overrides=[po2015_1885W, po2015_3108T, po2015_3034T, po2015_3070T]
+    ),
+    ("2016", False): SPEC_13_TO_18,
+    ("2016", True): SPEC_13_TO_18,
+    ("2017", False): SPEC_13_TO_18,
+    ("2017", True): SPEC_13_TO_18,
+    ("2018", False): SPEC_13_TO_18,
+    ("2018", True): SPEC_13_TO_18,
+    ("2019", False): SPEC_19,
+    ("2019", True): SPEC_19._replace(post_process=[assign_topics_2019]),
+    ("2021", False): SPEC_21,
+    ("2021", True): SPEC_21,
+    ("2022", False): SPEC_22,
+    ("2022", True): SPEC_22._replace(overrides=[po2022_1537]),
+    ("2023", False): ParserSpec(
+        get_page_lines,
+        "parse_page_23_non_poster",
+        "MARKERS_23_NON_POSTER",
+        state=dict(header=""),
+    ),
+    # The content of the first poster is told apart by its distance to the last line of the pages before it,
+    # including the front matter, so every page is parsed
+    ("2023", True): ParserSpec(
+        get_page_lines, "parse_page_23_poster", state=dict(last_line_bbox=None)
+    ),
+}
+
+# Years without an entry in the registry are parsed with the parser of the 2013 to 2018 layout
+DEFAULT_PARSER_SPEC = SPEC_13_TO_18
+
+
+def get_parser_spec(year, poster):
+    """
+    Returns the parser specification of the abstract book of a year.
+
+    Parameters:
+    -----------
+    year : str
+        The year of the abstract book.
+    poster : bool
+        Whether the abstract book holds poster abstracts.
+
+    Returns:
+    --------
+    ParserSpec
+        The parser specification.
+    """
+    return PARSER_REGISTRY.get((year, poster), DEFAULT_PARSER_SPEC)
+
+
+def plan_work_units(filename):
+    """
+    Plans the work units of a PDF file, one per section of its abstract book.
+
+    Parameters:
+    -----------
+    filename : str
+        The name of the PDF file, which holds the year of the abstract book and 'poster' for poster abstracts.
+
+    Returns:
+    --------
+    list of WorkUnit
+        The work units of the file, in the order of their sections, or an empty list if the filename holds no year.
+    """
+    match = re.search(r"(\d{4})", filename)
+    if not match:
+        return []
+    year, poster = match.group(1), "poster" in filename.lower()
+    name = os.path.splitext(filename)[0]
+    return [
+        WorkUnit(filename, year, poster, f"{name}-{suffix}" if suffix else name, idx)
+        for idx, (suffix, *_) in enumerate(get_parser_spec(year, poster).sections)
+    ]
+
+
+def classify_spec_pages(document, spec):
+    """
+    Classifies the pages of a document with the markers and section headings of a parser specification. For a
+    LayoutDocument, the classification is cached in its layout store, so that the pre-pass runs once per document
+    rather than once per work unit, and again only when the store is rebuilt or classify_pages changes.
+
+    Parameters:
+    -----------
+    document : list
+        A list where each element represents a page in the PDF document.
+    spec : ParserSpec
+        The parser specification of the document.
+
+    Returns:
+    --------
+    list of tuple
+        The classification of the pages, as returned by classify_pages.
+    """
+    headings = [heading for _, heading, _ in spec.sections if heading is not None]
+    if not isinstance(document, LayoutDocument):
+        return classify_pages(document, spec.markers, headings)
+
+    key = get_cache_key(
+        "page_kinds",
+        hash_sources(classify_pages),
+        repr(None if spec.markers is None else [p.pattern for p in spec.markers]),
+        repr([heading.pattern for heading in headings]),
+    )
+    page_kinds = load_from_cache(document.name, key)
+    if page_kinds is None:
+        page_kinds = classify_pages(document, spec.markers, headings)
+        save_to_cache(document.name, key, page_kinds)
+    return page_kinds
+
+
+def get_unit_pages(document, unit):
+    """
+    Derives the pages of the section of a work unit from a pre-pass classifying the pages of its document, so
+    that only the abstract pages of the section are extracted and parsed. Documents without markers and sections
+    are not classified, as all of their pages are parsed.
+
+    Parameters:
+    -----------
+    document : list
+        A list where each element represents a page in the PDF document of the work unit.
+    unit : WorkUnit
+        The work unit.
+
+    Returns:
+    --------
+    list of int
+        The indices of the abstract pages of the section, in order.
+    """
+    spec = get_parser_spec(unit.year, unit.poster)
+    expected = [pages for _, heading, pages in spec.sections if heading is not None]
+    if spec.markers is None and not expected:
+        return list(range(len(document)))
+    page_kinds = classify_spec_pages(document, spec)
+    return get_section_pages(page_kinds, len(expected), expected)[unit.section]
+
+
+def apply_overrides(df, overrides):
+    """
+    Replaces the fields of parsed data entries with the override entries of the same ID.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        The parsed data entries, with an 'id' column.
+    overrides : list of dict
+        The override entries, each with an 'id' field.
+
+    Returns:
+    --------
+    pd.DataFrame
+        The updated data entries.
+    """
+    import pandas as pd
+
+    df = df.set_index("id")
+    df.update(pd.DataFrame(overrides).set_index("id"))
+    return df.reset_index()
+
+
+def finish_frame(df, spec, year):
+    """
+    Applies the overrides and post-processing steps of a parser specification to the DataFrame of a section
+    and sets its year.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        The parsed data entries of the section.
+    spec : ParserSpec
+        The parser specification of the abstract book.
+    year : str
+        The year of the abstract book.
+
+    Returns:
+    --------
+    pd.DataFrame
+        The finished DataFrame.
+    """
+    if spec.overrides:
+        df = apply_overrides(df, spec.overrides)
+    for step in spec.post_process:
+        df = step(df)
+    df["year"] = year
+    return df
@@ -1,14 +1,19 @@
 import re
-import requests
 import os
 import logging
-from bs4 import BeautifulSoup
-from .enums import ParsingStage
+import numpy as np
+from itertools import compress
+from collections import defaultdict
+from .enums import ParsingStage, LineKind, PageKind
+from .layout import get_text_blocks
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
+# Session labels and page numbers removed from the topic spanning both columns of a page
+TOPIC_NOISE_PATTERN = re.compile(r"\s*Posters:?\s*|\s*\d+\s*")
+
 
 def ensure_folder_exists(folder_path):
     """
@@ -30,7 +35,7 @@ def ensure_folder_exists(folder_path):
         logging.info(f"Folder already exists: {folder_path}")
 
 
-def fetch_and_parse_url(url):
+def fetch_and_parse_url(url, session=None):
     """
     Fetches the content of the specified URL and parses it using BeautifulSoup.
 
@@ -38,6 +43,8 @@ def fetch_and_parse_url(url):
     -----------
     url : str
         The URL to fetch and parse.
+    session : requests.Session, optional
+        The HTTP session used for the request. A one-off request is made if None.
 
     Returns:
     --------
@@ -45,8 +52,12 @@ def fetch_and_parse_url(url):
         A BeautifulSoup object containing the parsed HTML content if the request is successful.
         Returns None if there is an error fetching the URL.
     """
+    # Only the sourcer fetches pages, so the parsers do not pay for importing requests and BeautifulSoup
+    import requests
+    from bs4 import BeautifulSoup
+
     try:
-        response = requests.get(url)
+        response = (session or requests).get(url)
         response.raise_for_status()
         return BeautifulSoup(response.text, "html.parser")
     except requests.RequestException as e:
@@ -54,37 +65,86 @@ def fetch_and_parse_url(url):
         return None
 
 
-def download_file(link, folder_path):
+def assemble_lines(lines, tolerance=5, sort=False):
     """
-    Downloads a file from the given URL and saves it to the specified folder. If the
-    file already exists, it will not be downloaded again.
+    Assembles lines of text into rebuilt lines. Consecutive lines whose top edges are within the tolerance of the
+    top edge of the line being rebuilt are merged into it, starting at its first non-blank span. Lines without text
+    do not start a rebuilt line.
 
     Parameters:
     -----------
-    link : str
-        The URL of the file to be downloaded.
-    folder_path : str
-        The path to the folder where the file should be saved.
+    lines : list of Line
+        The lines to be assembled in the order they were extracted, e.g. the lines of a column of a page.
+    tolerance : float, optional
+        The maximum vertical distance between the top edges of a line and the line it is merged into.
+    sort : bool, optional
+        Whether to sort the lines by their top edge first, and the lines of each rebuilt line by their left edge,
+        so that lines extracted out of vertical order are merged too.
 
     Returns:
     --------
-    None
+    list of Line
+        A list of rebuilt lines.
     """
-    filename = os.path.join(folder_path, link.split("/")[-1])
-    if os.path.exists(filename):
-        logging.info(f"{filename} already exists in {folder_path}")
-        return
-    try:
-        file_response = requests.get(link)
-        file_response.raise_for_status()
-        with open(filename, "wb") as f:
-            f.write(file_response.content)
-        logging.info(f"Successfully downloaded {filename}")
-    except requests.RequestException as e:
-        logging.error(f"Error downloading {link}: {e}")
+    if sort:
+        lines = sort_lines(lines, tolerance)
+    rebuilt_lines, changed_lines = [], []
+    for line in lines:
+        if (
+            not rebuilt_lines
+            or abs(line.bbox[1] - rebuilt_lines[-1].bbox[1]) > tolerance
+        ):
+            for idx, span in enumerate(line.spans):
+                if span.text.strip():
+                    # Start a new line at its first non-blank span
+                    if idx:
+                        line.spans = line.spans[idx:]
+                        changed_lines.append(line)
+                    line.bbox[0] = span.bbox[0]
+                    rebuilt_lines.append(line)
+                    break
+        else:
+            rebuilt_lines[-1].spans.extend(line.spans)
+            rebuilt_lines[-1].bbox[2] = line.bbox[2]
+            changed_lines.append(rebuilt_lines[-1])
+
+    # Recompute the text of lines whose spans changed, once per line
+    for line in set(changed_lines):
+        line.update_text()
+
+    return rebuilt_lines
 
 
-def get_lines_from_column(blocks):
+def sort_lines(lines, tolerance=5):
+    """
+    Sorts lines of text by their top edge, where lines whose top edges are within the tolerance of the top edge
+    of the first line of their group are sorted by their left edge, as in assemble_lines.
+
+    Parameters:
+    -----------
+    lines : list of Line
+        The lines to be sorted.
+    tolerance : float, optional
+        The maximum vertical distance between the top edges of the lines of a group.
+
+    Returns:
+    --------
+    list of Line
+        The sorted lines.
+    """
+    groups = []
+    for line in sorted(lines, key=lambda line: line.bbox[1]):
+        if not groups or line.bbox[1] - groups[-1][0].bbox[1] > tolerance:
+            groups.append([])
+        groups[-1].append(line)
+    return [
+        line
+        for group in groups
+        for line in sorted(group, key=lambda line: line.bbox[0])
+    ]
+
+
+def get_lines_from_column(blocks, sort=False):
     """
     Extracts and rebuilds lines of text from a list of text blocks, considering their bounding box coordinates.
 
@@ -92,34 +152,61 @@ def get_lines_from_column(blocks):
     -----------
     blocks : list
         A list of blocks, where each block contains lines of text with associated metadata (bounding box and spans).
+    sort : bool, optional
+        Whether to sort the lines by their position first, see assemble_lines.
 
     Returns:
     --------
-    list of dict
-        A list of lines, each represented as a dictionary containing 'spans' and 'bbox'.
+    list of Line
+        A list of rebuilt lines.
     """
-    lines = []
-    for block in blocks:
-        if "image" not in block:
-            for line in block["lines"]:
-                if not skip(line):
-                    lines.append(dict(spans=line["spans"], bbox=line["bbox"]))
+    return assemble_lines(
+        [
+            line
+            for block in blocks
+            if "image" not in block
+            for line in block["lines"]
+            if not skip(line)
+        ],
+        sort=sort,
+    )
 
-    rebuilt_lines = []
-    for line in lines:
-        if not rebuilt_lines or abs(line["bbox"][1] - rebuilt_lines[-1]["bbox"][1]) > 5:
-            for idx, span in enumerate(line["spans"]):
-                if span["text"].strip():
-                    rebuilt_lines.append(
-                        dict(spans=line["spans"][idx:], bbox=list(line["bbox"]))
-                    )
-                    rebuilt_lines[-1]["bbox"][0] = line["spans"][idx]["bbox"][0]
-                    break
-        else:
-            rebuilt_lines[-1]["spans"].extend(line["spans"])
-            rebuilt_lines[-1]["bbox"][2] = line["bbox"][2]
 
-    return rebuilt_lines
+def get_page_lines(page, sort=False):
+    """
+    Extracts and rebuilds the lines of text from a single-column page.
+
+    Parameters:
+    -----------
+    page : object
+        A page object containing text blocks with metadata.
+    sort : bool, optional
+        Whether to sort the lines by their position first, see assemble_lines.
+
+    Returns:
+    --------
+    list of Line
+        A list of rebuilt lines.
+    """
+    return get_lines_from_column(get_text_blocks(page)["blocks"], sort)
+
+
+def get_sorted_page_lines(page):
+    """
+    Extracts and rebuilds the lines of text from a single-column page, sorted by their position, so that lines
+    extracted out of vertical order are merged and parsed in reading order.
+
+    Parameters:
+    -----------
+    page : object
+        A page object containing text blocks with metadata.
+
+    Returns:
+    --------
+    list of Line
+        A list of rebuilt lines.
+    """
+    return get_page_lines(page, sort=True)
 
 
 def get_lines_from_page(page):
@@ -136,24 +223,513 @@ def get_lines_from_page(page):
     tuple
         A tuple where the first element is a list of organized lines (from left and right columns) and the second element is the topic of the page.
     """
-    page_dict = page.get_text("dict")
+    page_dict = get_text_blocks(page)
+    blocks, bboxes = page_dict["blocks"], page_dict["block_bbox"]
     mid = page_dict["width"] / 2
-    left_blocks, right_blocks, topic = [], [], ""
 
-    for block in page_dict["blocks"]:
-        if "lines" not in block:
+    # Classify the blocks by their geometry: blocks ending before the middle of the page belong to the left
+    # column, blocks starting after it to the right column, and the others span both columns
+    left = bboxes[:, 2] < mid + 20
+    right = ~left & (bboxes[:, 0] > mid - 20)
+
+    # The topic is the last spanning block that is not the copyright notice, so only spanning blocks are joined
+    topic = ""
+    for idx in np.flatnonzero(~(left | right))[::-1]:
+        content = " ".join(get_text(line) for line in blocks[idx]["lines"])
+        if "Copyright" not in content:
+            topic = TOPIC_NOISE_PATTERN.sub("", content).strip()
+            break
+
+    left_lines, right_lines = (
+        get_lines_from_column(list(compress(blocks, mask))) for mask in (left, right)
+    )
+    return left_lines + right_lines, topic
+
+
+def iter_records(
+    document, pages, read_page, parse_page, state=None, on_error=None, checkpoint=None
+):
+    """
+    Runs a page-level parser over a range of pages of a document and yields the parsed data entries as they are
+    completed. After each page, every entry but the last is final, since page parsers only continue the last
+    entry, so those entries are yielded and dropped from the parsing state.
+
+    Parameters:
+    -----------
+    document : object
+        A document object whose pages can be accessed by index.
+    pages : iterable of int or None
+        The indices of the pages to be parsed. All pages are parsed if None.
+    read_page : callable
+        A function extracting the content (e.g. rebuilt lines) the parser consumes from a page.
+    parse_page : callable
+        A function updating the parsing state with the content of a page.
+    state : dict, optional
+        The parsing state to continue from, holding any state the parser carries across pages. A new state with
+        an empty 'data' list is created if None.
+    on_error : callable, optional
+        A function called with the page index and the error when reading or parsing a page raises an exception,
+        after which the next page is parsed. The lines of the page parsed before the error are kept. Errors are
+        raised if None.
+    checkpoint : PageCheckpoint, optional
+        The checkpoint the progress is saved to every checkpoint.interval pages. If it holds a checkpoint, the
+        entries completed before it are yielded and parsing resumes from the saved state and page.
+
+    Yields:
+    -------
+    dict
+        The parsed data entries with all fields as strings, in order.
+    """
+    state = dict(data=[]) if state is None else state
+    pages = list(range(len(document)) if pages is None else pages)
+    start, completed = 0, []
+
+    if checkpoint is not None and (saved := checkpoint.load()) is not None:
+        start, state, records = saved
+        logging.info(
+            f"Resuming from page {pages[start] if start < len(pages) else 'end'} "
+            f"with {len(records)} entries from {checkpoint.checkpoint_dir}"
+        )
+        yield from records
+
+    data = state["data"]
+    for position in range(start, len(pages)):
+        try:
+            parse_page(state, read_page(document[pages[position]]))
+        except Exception as error:
+            if on_error is None:
+                raise
+            on_error(pages[position], error)
+        records = list(map(finalize_record, data[:-1]))
+        del data[:-1]
+        yield from records
+
+        if checkpoint is not None:
+            completed.extend(records)
+            if (position + 1) % checkpoint.interval == 0:
+                checkpoint.save(position + 1, state, completed)
+                completed = []
+
+    yield from map(finalize_record, data)
+    data.clear()
+    if checkpoint is not None:
+        checkpoint.clear()
+
+
+def classify_pages(document, markers, headings=()):
+    """
+    Classifies the pages of a document with a cheap pre-pass over their plain text, so that the lines of a page
+    are only extracted and parsed if it holds abstracts. Pages before the first page with an abstract marker are
+    front matter, pages without a marker holding a section heading are section pages, and all other pages are
+    abstract pages, including pages continuing the abstract of a previous page.
+
+    Parameters:
+    -----------
+    document : list
+        A list where each element represents a page in the PDF document.
+    markers : list of re.Pattern or None
+        The patterns of the lines starting an abstract or otherwise updating the parsing state. If None, no page
+        is front matter.
+    headings : list of re.Pattern, optional
+        The patterns of the headings of the sections of the document, in order.
+
+    Returns:
+    --------
+    list of tuple
+        A (PageKind, int) pair for each page, where the int is the index of the heading of a section page and
+        None for other pages.
+    """
+    page_kinds, started = [], markers is None
+    for page in document:
+        lines = page.get_text("text").splitlines()
+        if any(marker.search(line) for marker in markers or () for line in lines):
+            started = True
+            page_kinds.append((PageKind.ABSTRACT, None))
             continue
+        heading = next(
+            (
+                idx
+                for idx, pattern in enumerate(headings)
+                if any(pattern.search(line) for line in lines)
+            ),
+            None,
+        )
+        if heading is not None:
+            page_kinds.append((PageKind.SECTION, heading))
+        else:
+            page_kinds.append(
+                (PageKind.ABSTRACT if started else PageKind.FRONT_MATTER, None)
+            )
+    return page_kinds
 
-        content = " ".join(get_text(line) for line in block["lines"])
-        if block["bbox"][2] < mid + 20:
-            left_blocks.append(block)
-        elif block["bbox"][0] > mid - 20:
-            right_blocks.append(block)
-        elif not re.search("Copyright", content):
-            topic = re.sub(r"\s*Posters:?\s*|\s*\d+\s*", "", content).strip()
 
-    left_lines, right_lines = map(get_lines_from_column, [left_blocks, right_blocks])
-    return left_lines + right_lines, topic
+def get_section_pages(page_kinds, n_sections=0, expected=None):
+    """
+    Derives the abstract pages of each section of a document from the classification of its pages. A section
+    spans the abstract pages after the last page with its heading up to the next section page. A heading is
+    only accepted until the first abstract page of its section, so headings repeated in the front matter, e.g.
+    in the table of contents, are skipped, while pages repeating the heading of a section that already started,
+    e.g. running headers or cross-references, continue the current section.
+
+    Parameters:
+    -----------
+    page_kinds : list of tuple
+        The classification of the pages, as returned by classify_pages.
+    n_sections : int, optional
+        The number of section headings the pages were classified with. If 0, the document is a single section.
+    expected : list of range, optional
+        The pages of each section as previously known, e.g. formerly hard-coded page ranges, to check the derived
+        pages against. A warning is logged for a section whose derived pages leave out abstract pages of its
+        expected range or fall outside it, but the derived pages are used. None entries are not checked.
+
+    Returns:
+    --------
+    list of list of int
+        The indices of the abstract pages of each section, in order.
+
+    Raises:
+    -------
+    ValueError
+        If the heading of a section is not found in the document.
+    """
+    if not n_sections:
+        return [
+            [
+                idx
+                for idx, (kind, _) in enumerate(page_kinds)
+                if kind == PageKind.ABSTRACT
+            ]
+        ]
+
+    sections, current = [None] * n_sections, None
+    for idx, (kind, heading) in enumerate(page_kinds):
+        if kind == PageKind.SECTION and not sections[heading]:
+            current = heading
+            sections[current] = []  # The last page with the heading starts the section
+        elif kind != PageKind.FRONT_MATTER and current is not None:
+            sections[current].append(idx)
+
+    missing = [idx for idx, pages in enumerate(sections) if pages is None]
+    if missing:
+        raise ValueError(f"Section headings {missing} not found in the document")
+
+    for idx, pages in enumerate(expected or ()):
+        if pages is None:
+            continue
+        # The derived pages match if they are within the expected range and cover all of its abstract pages
+        abstract_pages = {
+            page
+            for page in pages
+            if page < len(page_kinds) and page_kinds[page][0] == PageKind.ABSTRACT
+        }
+        if not abstract_pages <= set(sections[idx]) <= set(pages):
+            logging.warning(
+                f"Pages {sections[idx][0] if sections[idx] else '-'}-"
+                f"{sections[idx][-1] if sections[idx] else '-'} of section {idx} derived from its "
+                f"heading do not match the expected pages {pages.start}-{pages.stop - 1}"
+            )
+    return sections
+
+
+def split_pages(pages, shard_pages):
+    """
+    Splits a range of pages into consecutive shards.
+
+    Parameters:
+    -----------
+    pages : sequence of int
+        The indices of the pages to be split.
+    shard_pages : int
+        The maximum number of pages in each shard.
+
+    Returns:
+    --------
+    list
+        A list of consecutive slices of the pages, each holding at most shard_pages pages.
+    """
+    return [pages[idx : idx + shard_pages] for idx in range(0, len(pages), shard_pages)]
+
+
+def parse_shard(document, pages, read_page, parse_page, on_error=None):
+    """
+    Parses a shard of pages independently of the pages before it, so that shards can be parsed in
+    separate processes and combined with stitch_shards.
+
+    The entry in progress at the start of the shard is unknown, so lines before the first new entry are
+    collected into a placeholder entry that is discarded. The content of the pages up to and including
+    the page where the first new entry starts is kept, so the lines can be replayed onto the real entry.
+    This includes the pages of the head that fail to parse once read, so that the lines parsed before the
+    error are kept, as in iter_records.
+
+    Parameters:
+    -----------
+    document : object
+        A document object whose pages can be accessed by index.
+    pages : iterable of int
+        The indices of the pages in the shard.
+    read_page : callable
+        A function extracting the content the parser consumes from a page.
+    parse_page : callable
+        A function updating the parsing state with the content of a page.
+    on_error : callable, optional
+        A function called with the page index and the error when reading or parsing a page raises an exception,
+        as in iter_records. Errors are raised if None.
+
+    Returns:
+    --------
+    dict
+        A dictionary containing:
+        - head: The (page index, content) pairs of the pages to be replayed onto the last entry of the
+          previous shard.
+        - data: The list of entries starting within the shard.
+        - quarantined: The indices of the pages that failed to parse.
+    """
+    state, head, quarantined = dict(data=[defaultdict(TextBuilder)]), [], []
+    for page_num in pages:
+        in_head = len(state["data"]) == 1
+        try:
+            page_content = read_page(document[page_num])
+            if in_head:
+                head.append((page_num, page_content))
+            parse_page(state, page_content)
+        except Exception as error:
+            if on_error is None:
+                raise
+            on_error(page_num, error)
+            quarantined.append(page_num)
+    return dict(head=head, data=state["data"][1:], quarantined=quarantined)
+
+
+def stitch_shards(shards, parse_page, on_error=None):
+    """
+    Combines the results of parse_shard for consecutive shards into a single parsing state. The head of
+    each shard is replayed onto the last entry of the previous shard, which completes any entry spanning
+    a shard boundary. The pages quarantined by their shard are replayed too, and are not reported again if
+    they fail in the same way, so the lines parsed before the error are kept.
+
+    Parameters:
+    -----------
+    shards : iterable of dict
+        The results of parse_shard, in page order.
+    parse_page : callable
+        The function updating the parsing state with the content of a page, as used for the shards.
+    on_error : callable, optional
+        A function called with the page index and the error when replaying a page that was not quarantined by
+        its shard raises an exception, as in iter_records. Errors are raised if None.
+
+    Returns:
+    --------
+    dict
+        The parsing state, where 'data' holds the list of parsed data entries.
+    """
+    state = dict(data=[])
+    for shard in shards:
+        if state["data"]:
+            tail = dict(data=[state["data"].pop()])
+            for page_num, page_content in shard["head"]:
+                try:
+                    parse_page(tail, page_content)
+                except Exception as error:
+                    if page_num in shard["quarantined"]:
+                        continue
+                    if on_error is None:
+                        raise
+                    on_error(page_num, error)
+            state["data"].append(tail["data"][0])
+        state["data"].extend(shard["data"])
+    return state
+
+
+class TextBuilder:
+    """
+    Accumulates the text of a field of a data entry as a list of fragments, which are joined once when the
+    entry is finalized. Trailing whitespace and dashes are removed from the last fragments in place, so
+    continuing a field never copies the text accumulated so far.
+
+    Attributes:
+    -----------
+    fragments : list of str
+        The non-empty fragments of the text, in order.
+    """
+
+    __slots__ = ("fragments",)
+
+    def __init__(self, text=""):
+        self.fragments = [text] if text else []
+
+    def append(self, text):
+        """
+        Appends a fragment to the end of the text.
+        """
+        if text:
+            self.fragments.append(text)
+
+    def rstrip(self):
+        """
+        Removes trailing whitespace from the text in place.
+        """
+        while self.fragments:
+            fragment = self.fragments[-1].rstrip()
+            if fragment:
+                self.fragments[-1] = fragment
+                return
+            self.fragments.pop()
+
+    def chop(self):
+        """
+        Removes trailing whitespace and the last character from the text in place.
+        """
+        self.rstrip()
+        if self.fragments:
+            fragment = self.fragments[-1][:-1]
+            if fragment:
+                self.fragments[-1] = fragment
+            else:
+                self.fragments.pop()
+
+    def tail(self):
+        """
+        Returns the last fragment that is not only whitespace, with trailing whitespace removed. It ends the
+        same way as the full text with trailing whitespace removed.
+        """
+        for fragment in reversed(self.fragments):
+            if fragment := fragment.rstrip():
+                return fragment
+        return ""
+
+    def __bool__(self):
+        return bool(self.fragments)
+
+    def __str__(self):
+        if len(self.fragments) > 1:
+            self.fragments = ["".join(self.fragments)]
+        return self.fragments[0] if self.fragments else ""
+
+    def __repr__(self):
+        return f"TextBuilder({str(self)!r})"
+
+
+def get_tail(text):
+    """
+    Returns the end of a text with trailing whitespace removed, for checking how the text ends.
+
+    Parameters:
+    -----------
+    text : str or TextBuilder
+        The text to check.
+
+    Returns:
+    --------
+    str
+        The text with trailing whitespace removed, or for a TextBuilder only its last non-blank fragment.
+    """
+    return text.tail() if isinstance(text, TextBuilder) else text.rstrip()
+
+
+def finalize_record(record):
+    """
+    Converts the fields of a parsed data entry accumulated in TextBuilders into strings and strips their
+    trailing whitespace, once per field as the entry is completed.
+
+    Parameters:
+    -----------
+    record : dict
+        A parsed data entry.
+
+    Returns:
+    --------
+    dict
+        The data entry with all fields as strings without trailing whitespace.
+    """
+    return {key: str(value).rstrip() for key, value in record.items()}
+
+
+def records_to_frame(records):
+    """
+    Collects finalized data entries into a DataFrame. The fields are already strings without trailing
+    whitespace, so the frame is built as is rather than converted and stripped cell by cell.
+
+    Parameters:
+    -----------
+    records : iterable of dict
+        The finalized data entries, as returned by finalize_record.
+
+    Returns:
+    --------
+    pd.DataFrame
+        A DataFrame with one row per data entry and one column per field.
+    """
+    # pandas is imported on first use, so that importing the parsers does not load it
+    import pandas as pd
+
+    return pd.DataFrame(records)
+
+
+class IdRangeIndex:
+    """
+    Looks up the label of the range of IDs an ID falls in, e.g. the session of an abstract from its number when
+    sessions are assigned consecutive ranges of abstract numbers. The ranges are kept as sorted boundary arrays,
+    so a whole column of IDs is looked up at once with a binary search.
+
+    Attributes:
+    -----------
+    starts : np.ndarray
+        The first ID of each range, in ascending order.
+    ends : np.ndarray
+        The last ID of each range, inclusive.
+    labels : np.ndarray
+        The label of each range.
+    """
+
+    __slots__ = ("starts", "ends", "labels")
+
+    def __init__(self, mapping):
+        """
+        Builds the index from a dictionary mapping each label to the first and last ID of its range.
+
+        Raises:
+        -------
+        ValueError
+            If a range is empty or overlaps another range.
+        """
+        items = sorted(mapping.items(), key=lambda item: item[1][0])
+        self.starts = np.array([start for _, (start, _) in items], dtype=np.int64)
+        self.ends = np.array([end for _, (_, end) in items], dtype=np.int64)
+        self.labels = np.array([label for label, _ in items], dtype=object)
+        if (self.ends < self.starts).any() or (self.starts[1:] <= self.ends[:-1]).any():
+            raise ValueError("ID ranges must be non-empty and must not overlap")
+
+    def lookup(self, ids, default=None):
+        """
+        Returns the label of the range each ID falls in. IDs that are not numbers or do not fall in any range
+        are given the default label, and a warning lists them.
+
+        Parameters:
+        -----------
+        ids : pd.Series
+            The IDs to look up, as integers or strings of digits.
+        default : object, optional
+            The label of IDs outside all ranges.
+
+        Returns:
+        --------
+        pd.Series
+            The labels, with the same index as the IDs.
+        """
+        import pandas as pd
+
+        numbers = pd.to_numeric(ids, errors="coerce").to_numpy(dtype=np.float64)
+        # Find the last range starting at or before each ID, then check that the ID is not past its end
+        positions = np.searchsorted(self.starts, numbers, side="right") - 1
+        found = (positions >= 0) & (numbers <= self.ends[positions.clip(0)])
+        labels = np.where(found, self.labels[positions.clip(0)], default)
+
+        if not found.all():
+            missing = ids[~found]
+            logging.warning(
+                f"{len(missing)} IDs are outside all ranges and set to {default!r}: {missing.tolist()[:10]}"
+            )
+        return pd.Series(labels, index=ids.index, dtype=object)
 
 
 def update_data(data, current_stage, content):
@@ -163,7 +739,7 @@ def update_data(data, current_stage, content):
     Parameters:
     -----------
     data : list of dict
-        The list of parsed data entries.
+        The list of parsed data entries, whose text fields are TextBuilders.
     current_stage : ParsingStage
         The current stage of parsing (e.g., TITLE, AUTHORS, CONTENT).
     content : str
@@ -176,42 +752,111 @@ def update_data(data, current_stage, content):
     """
     match current_stage:
         case ParsingStage.TITLE:
-            data[-1]["title"] = (
+            if ends_with_dash(data[-1]["title"]):
                 data[-1]["title"].rstrip()
-                if ends_with_dash(data[-1]["title"])
-                else data[-1]["title"]
-            )
-            data[-1]["title"] += content + " "
+            data[-1]["title"].append(content + " ")
         case ParsingStage.AUTHORS:
-            data[-1]["authors"] += content + " "
+            data[-1]["authors"].append(content + " ")
         case ParsingStage.AFFILIATIONS:
-            data[-1]["affiliations"] += content + " "
+            data[-1]["affiliations"].append(content + " ")
         case ParsingStage.CONTENT:
-            data[-1]["content"] = (
+            if ends_with_dash(data[-1]["content"]):
                 data[-1]["content"].rstrip()
-                if ends_with_dash(data[-1]["content"])
-                else data[-1]["content"]
-            )
-            data[-1]["content"] += content + " "
+            data[-1]["content"].append(content + " ")
 
     return data
 
 
+def compile_line_patterns(patterns):
+    """
+    Compiles the regular expressions classifying the lines of an abstract book into a lookup table.
+
+    Parameters:
+    -----------
+    patterns : dict
+        A dictionary mapping each LineKind to a pattern, or to a tuple of alternative patterns, in order of precedence.
+
+    Returns:
+    --------
+    list of tuple
+        A list of (LineKind, list of compiled patterns) pairs, in order of precedence.
+    """
+    return [
+        (
+            kind,
+            [
+                re.compile(pattern)
+                for pattern in ((value,) if isinstance(value, str) else value)
+            ],
+        )
+        for kind, value in patterns.items()
+    ]
+
+
+def get_line_patterns(line_patterns, kinds):
+    """
+    Collects the compiled patterns of the given kinds from a lookup table of line patterns.
+
+    Parameters:
+    -----------
+    line_patterns : list of tuple
+        The lookup table, as returned by compile_line_patterns.
+    kinds : iterable of LineKind
+        The kinds of lines whose patterns are collected.
+
+    Returns:
+    --------
+    list of re.Pattern
+        The patterns of the given kinds, in order of precedence.
+    """
+    return [
+        pattern
+        for kind, patterns in line_patterns
+        if kind in kinds
+        for pattern in patterns
+    ]
+
+
+def classify_line(line_patterns, content):
+    """
+    Classifies a line by the first kind in the lookup table with a pattern found in the line.
+    The lookup stops at the first match, so lines of a kind of high precedence are never searched for the others.
+
+    Parameters:
+    -----------
+    line_patterns : list of tuple
+        The lookup table, as returned by compile_line_patterns.
+    content : str
+        The text content of the line.
+
+    Returns:
+    --------
+    tuple
+        A tuple (LineKind, re.Match) of the kind of the line and the match of its pattern, or (None, None) if no
+        pattern is found in the line.
+    """
+    for kind, patterns in line_patterns:
+        for pattern in patterns:
+            if match := pattern.search(content):
+                return kind, match
+    return None, None
+
+
 def is_id(line):
     """
     Checks if a line represents an identifier based on font size.
 
     Parameters:
     -----------
-    line : dict
-        A dictionary representing a line with metadata.
+    line : Line
+        A line of text with metadata.
 
     Returns:
     --------
     bool
         True if the line's font size indicates it is an identifier, otherwise False.
     """
-    return line["spans"][0]["size"] == 10
+    return line.spans[0].size == 10
 
 
 def is_page_num(line):
@@ -220,15 +865,15 @@ def is_page_num(line):
 
     Parameters:
     -----------
-    line : dict
-        A dictionary representing a line with metadata.
+    line : Line
+        A line of text with metadata.
 
     Returns:
     --------
     bool
         True if the line represents a page number, otherwise False.
     """
-    return line["spans"][0]["size"] == 9 and get_text(line).strip().isdigit()
+    return line.spans[0].size == 9 and get_text(line).strip().isdigit()
 
 
 def is_marker(line):
@@ -237,8 +882,8 @@ def is_marker(line):
 
     Parameters:
     -----------
-    line : dict
-        A dictionary representing a line with metadata.
+    line : Line
+        A line of text with metadata.
 
     Returns:
     --------
@@ -250,21 +895,20 @@ def is_marker(line):
 
 def get_text(line):
     """
-    Extracts and concatenates text from a line, handling special characters.
+    Returns the concatenated text of a line. The text is computed once when the line is built, from spans
+    whose text was normalized when it was extracted.
 
     Parameters:
     -----------
-    line : dict
-        A dictionary representing a line with text spans.
+    line : Line
+        A line of text with spans.
 
     Returns:
     --------
     str
         The concatenated text from the line.
     """
-    return " ".join(
-        span["text"].replace("\x00", " ") for span in line["spans"]
-    ).rstrip()
+    return line.text
 
 
 def is_empty(line):
@@ -273,8 +917,8 @@ def is_empty(line):
 
     Parameters:
     -----------
-    line : dict
-        A dictionary representing a line with text spans.
+    line : Line
+        A line of text with spans.
 
     Returns:
     --------
@@ -290,8 +934,8 @@ def skip(line):
 
     Parameters:
     -----------
-    line : dict
-        A dictionary representing a line with metadata.
+    line : Line
+        A line of text with metadata.
 
     Returns:
     --------
@@ -303,11 +947,12 @@ def skip(line):
 
 def ends_with_dash(string):
     """
-    Checks if a string ends with a dash character.
+    Checks if a string ends with a dash character, or with a soft hyphen, which marks a word broken at the end
+    of a line.
 
     Parameters:
     -----------
-    string : str
+    string : str or TextBuilder
         The string to check.
 
     Returns:
@@ -315,17 +960,17 @@ def ends_with_dash(string):
     bool
         True if the string ends with a dash, otherwise False.
     """
-    return string.rstrip().endswith("-")
+    return get_tail(string).endswith(("-", "\xad"))
 
 
 def get_fonts_and_texts(line):
     """
-    Extracts fonts and text segments from a line, handling special characters.
+    Extracts fonts and text segments from a line. The result is computed on first use and memoized on the line.
 
     Parameters:
     -----------
-    line : dict
-        A dictionary representing a line with text spans.
+    line : Line
+        A line of text with spans.
 
     Returns:
     --------
@@ -335,19 +980,9 @@ def get_fonts_and_texts(line):
         - texts: A list of text segments.
     """
     if line:
-        fonts, texts = [], []
-        for span in line["spans"]:
-            font = span["font"]
-            text = span["text"]
-            if "\x00" in text:
-                split_texts = text.split("\x00")
-                split_texts = [t for t in split_texts if t]
-                texts.extend(split_texts)
-                fonts.extend([font] * len(split_texts))
-            else:
-                texts.append(text)
-                fonts.append(font)
-        return fonts, texts
+        if line.fonts is None:
+            line.update_fonts_and_texts()
+        return line.fonts, line.texts
     return [], []
 
 
@@ -377,7 +1012,7 @@ def is_title_end(string):
 
     Parameters:
     -----------
-    string : str
+    string : str or TextBuilder
         The string to check.
 
     Returns:
@@ -385,7 +1020,7 @@ def is_title_end(string):
     bool
         True if the string ends with a period, exclamation mark, or question mark, otherwise False.
     """
-    return string.rstrip().endswith((".", "!", "?"))
+    return get_tail(string).endswith((".", "!", "?"))
 
 
 def is_authors_end(string):
@@ -394,7 +1029,7 @@ def is_authors_end(string):
 
     Parameters:
     -----------
-    string : str
+    string : str or TextBuilder
         The string to check.
 
     Returns:
@@ -402,7 +1037,7 @@ def is_authors_end(string):
     bool
         True if the string ends with a period, otherwise False.
     """
-    return string.rstrip().endswith(".")
+    return get_tail(string).endswith(".")
 
 
 def is_content_start_x1(line, x1):
@@ -411,8 +1046,8 @@ def is_content_start_x1(line, x1):
 
     Parameters:
     -----------
-    line : dict
-        A dictionary representing a line with bounding box metadata.
+    line : Line
+        A line of text with bounding box metadata.
     x1 : float
         The x-coordinate used to determine if the content starts a new section.
 
@@ -422,9 +1057,7 @@ def is_content_start_x1(line, x1):
         True if the line starts a new content section, otherwise False.
     """
     return (
-        abs(line["bbox"][0] - x1) > 5 or get_text(line).startswith(("\xa0", " "))
-        if line
-        else False
+        abs(line.bbox[0] - x1) > 5 or get_text(line).startswith(" ") if line else False
     )
 
 
@@ -434,8 +1067,8 @@ def is_content_start_x2(line, x2):
 
     Parameters:
     -----------
-    line : dict
-        A dictionary representing a line with bounding box metadata.
+    line : Line
+        A line of text with bounding box metadata.
     x2 : float
         The x2-coordinate used to determine if the content starts a new section.
 
@@ -444,7 +1077,7 @@ def is_content_start_x2(line, x2):
     bool
         True if the line starts a new content section, otherwise False.
     """
-    return abs(line["bbox"][2] - x2) > 20 if line else False
+    return abs(line.bbox[2] - x2) > 20 if line else False
 
 
 def is_content_start_y(last_line_bbox, current_line_bbox, threshold):
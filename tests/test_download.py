@@ -0,0 +1,192 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from src.download import create_session, download_file
+
+BODY = bytes(range(256)) * 40
+ETAG = '"v1"'
+LAST_MODIFIED = "Mon, 02 Oct 2023 10:00:00 GMT"
+
+
+class FileHandler(BaseHTTPRequestHandler):
+    """
+    Serves the files of the server, honoring Range, If-Range, If-None-Match and If-Modified-Since as a static
+    file server does, and records the headers of each request.
+    """
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_file_headers(self, file, status, length):
+        self.send_response(status)
+        if file["etag"]:
+            self.send_header("ETag", file["etag"])
+        if file["last_modified"]:
+            self.send_header("Last-Modified", file["last_modified"])
+        self.send_header("Content-Length", str(length))
+
+    def do_HEAD(self):
+        file = self.server.files[self.path]
+        self.server.requests.append(("HEAD", dict(self.headers)))
+        self.send_file_headers(file, 200, len(file["body"]))
+        self.end_headers()
+
+    def do_GET(self):
+        file = self.server.files[self.path]
+        self.server.requests.append(("GET", dict(self.headers)))
+        body = file["body"]
+        if (file["etag"] and self.headers.get("If-None-Match") == file["etag"]) or (
+            file["last_modified"]
+            and self.headers.get("If-Modified-Since") == file["last_modified"]
+        ):
+            self.send_file_headers(file, 304, 0)
+            self.end_headers()
+            return
+
+        if_range = self.headers.get("If-Range")
+        start = None
+        if self.headers.get("Range") and if_range in (
+            None,
+            file["etag"],
+            file["last_modified"],
+        ):
+            start = int(self.headers["Range"].removeprefix("bytes=").rstrip("-"))
+        if start is not None and start >= len(body):
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{len(body)}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if start is None:
+            self.send_file_headers(file, 200, len(body))
+            start = 0
+        else:
+            self.send_file_headers(file, 206, len(body) - start)
+            self.send_header(
+                "Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}"
+            )
+        self.end_headers()
+        self.wfile.write(body[start:])
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FileHandler)
+    server.files = {
+        "/abstracts.pdf": dict(body=BODY, etag=ETAG, last_modified=LAST_MODIFIED)
+    }
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def link(server):
+    return f"http://127.0.0.1:{server.server_port}/abstracts.pdf"
+
+
+def download(link, folder_path, manifest):
+    return download_file(
+        link, str(folder_path), create_session(), manifest, retries=0, timeout=5
+    )
+
+
+def read_file(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def write_file(path, content):
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+def test_download_records_validators(server, link, tmp_path):
+    manifest = {}
+    path = download(link, tmp_path, manifest)
+    assert read_file(path) == BODY
+    assert not os.path.exists(f"{path}.part")
+    assert manifest["abstracts.pdf"]["etag"] == ETAG
+    assert manifest["abstracts.pdf"]["last_modified"] == LAST_MODIFIED
+    assert manifest["abstracts.pdf"]["size"] == len(BODY)
+
+
+def test_partial_file_is_resumed_with_if_range(server, link, tmp_path):
+    manifest = {"abstracts.pdf": dict(etag=ETAG, last_modified=LAST_MODIFIED)}
+    write_file(tmp_path / "abstracts.pdf.part", BODY[:1000])
+    path = download(link, tmp_path, manifest)
+    assert read_file(path) == BODY
+    [(method, headers)] = server.requests
+    assert headers["Range"] == "bytes=1000-"
+    assert headers["If-Range"] == ETAG
+
+
+def test_partial_file_of_changed_file_is_downloaded_again(server, link, tmp_path):
+    manifest = {"abstracts.pdf": dict(etag='"v0"', last_modified=None)}
+    write_file(tmp_path / "abstracts.pdf.part", b"\0" * 1000)
+    path = download(link, tmp_path, manifest)
+    assert read_file(path) == BODY
+    assert manifest["abstracts.pdf"]["etag"] == ETAG
+
+
+def test_complete_partial_file_keeps_validators(server, link, tmp_path):
+    manifest = {"abstracts.pdf": dict(etag=ETAG, last_modified=LAST_MODIFIED)}
+    write_file(tmp_path / "abstracts.pdf.part", BODY)
+    path = download(link, tmp_path, manifest)
+    assert read_file(path) == BODY
+    [(method, headers)] = server.requests
+    assert headers["Range"] == f"bytes={len(BODY)}-"
+    assert manifest["abstracts.pdf"]["etag"] == ETAG
+    assert manifest["abstracts.pdf"]["last_modified"] == LAST_MODIFIED
+
+
+@pytest.mark.parametrize(
+    "etag, last_modified, header",
+    [
+        (ETAG, LAST_MODIFIED, "If-None-Match"),
+        (None, LAST_MODIFIED, "If-Modified-Since"),
+    ],
+)
+def test_unchanged_file_is_not_downloaded_again(
+    server, link, tmp_path, etag, last_modified, header
+):
+    server.files["/abstracts.pdf"].update(etag=etag, last_modified=last_modified)
+    manifest = {}
+    path = download(link, tmp_path, manifest)
+    server.requests.clear()
+    assert download(link, tmp_path, manifest) == path
+    [(method, headers)] = server.requests
+    assert method == "GET" and header in headers
+    assert read_file(path) == BODY
+
+
+def test_corrupted_file_is_downloaded_again(server, link, tmp_path):
+    manifest = {}
+    path = download(link, tmp_path, manifest)
+    write_file(path, b"\0" * len(BODY))
+    assert read_file(download(link, tmp_path, manifest)) == BODY
+
+
+def test_file_without_validators_is_checked_by_size(server, link, tmp_path):
+    server.files["/abstracts.pdf"].update(etag=None, last_modified=None)
+    manifest = {}
+    path = download(link, tmp_path, manifest)
+    server.requests.clear()
+    assert download(link, tmp_path, manifest) == path
+    assert [method for method, headers in server.requests] == ["HEAD"]
+
+    server.files["/abstracts.pdf"]["body"] = BODY[::-1] + b"\0"
+    assert read_file(download(link, tmp_path, manifest)) == BODY[::-1] + b"\0"
+
+
+def test_existing_file_without_manifest_entry_is_adopted(server, link, tmp_path):
+    write_file(tmp_path / "abstracts.pdf", BODY)
+    manifest = {}
+    download(link, tmp_path, manifest)
+    assert [method for method, headers in server.requests] == ["HEAD", "GET"]
+    assert server.requests[1][1]["If-None-Match"] == ETAG
+    assert manifest["abstracts.pdf"]["etag"] == ETAG
@@ -0,0 +1,86 @@
+import pytest
+from src.layout import Line, Span, normalize_text, merge_split_spans
+from src.utils import TextBuilder, ends_with_dash, finalize_record
+
+# Soft hyphens within the lines of the 2016 and 2018 books, next to the dashes and letters they must not alter
+SOFT_HYPHENS_WITHIN_LINES = [
+    ("tissue\xad-specific", "tissue-specific"),
+    ("co\xad-regulatory", "co-regulatory"),
+    ("p ≤ 5 x 10 \xad-8 )", "p ≤ 5 x 10 -8 )"),
+    ("complex rearrangements \xad– via joint", "complex rearrangements – via joint"),
+    ("1,897 Sāmoans\xad—the Sāmoan", "1,897 Sāmoans—the Sāmoan"),
+    ("mortality worldwide. \xadWhile T2D", "mortality worldwide. While T2D"),
+]
+
+# Soft hyphens between two letters within the lines of the 2018 book, which are compound hyphens
+SOFT_HYPHENS_WITHIN_WORDS = [
+    ("novel disease\xadassociated variants", "novel disease-associated variants"),
+    (
+        "identified by genome\xadwide association",
+        "identified by genome-wide association",
+    ),
+    ("strongly co\xadlocalized signals", "strongly co-localized signals"),
+    ("clinical and health\xadrelated ", "clinical and health-related "),
+]
+
+
+@pytest.mark.parametrize("text, expected", SOFT_HYPHENS_WITHIN_LINES)
+def test_normalize_text_removes_soft_hyphens_within_lines(text, expected):
+    assert normalize_text(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", SOFT_HYPHENS_WITHIN_WORDS)
+def test_normalize_text_keeps_soft_hyphens_within_words_as_hyphens(text, expected):
+    assert normalize_text(text) == expected
+
+
+def test_normalize_text_keeps_soft_hyphen_ending_span():
+    assert normalize_text("into population histo\xad") == "into population histo\xad"
+    assert normalize_text("co\xadlocalized histo\xad ") == "co-localized histo\xad"
+
+
+def test_line_removes_soft_hyphens_of_merged_spans():
+    spans = [
+        Span("population histo\xad", "Arial", 9, (0, 0, 50, 9)),
+        Span("ry and", "Arial", 9, (50, 0, 80, 9)),
+        Span("genomic disco\xad", "Arial", 9, (80, 0, 120, 9)),
+        Span(" ", "Arial", 9, (120, 0, 122, 9)),
+    ]
+    line = Line(spans, [0, 0, 122, 9])
+    assert line.text == "population histo ry and genomic disco\xad"
+    line.update_fonts_and_texts()
+    assert line.texts == ["population histo", "ry and", "genomic disco\xad", " "]
+    assert spans[0].text == "population histo\xad"
+
+
+def test_merge_split_spans_rebuilds_words_split_at_ligatures():
+    spans = [
+        dict(
+            text="Session 010: Mul", font="Calibri", size=12, bbox=(72, 71, 133.8, 83)
+        ),
+        dict(text="\u019f", font="Calibri", size=12, bbox=(133.8, 71, 138.8, 83)),
+        dict(text="-ancestry", font="Calibri", size=12, bbox=(138.8, 71, 265, 83)),
+        dict(text=" ", font="TimesNewRoman", size=12, bbox=(265, 69, 268, 84)),
+    ]
+    line = Line.from_dict(dict(spans=spans, bbox=(72, 69, 268, 84)))
+    assert line.text == "Session 010: Multi-ancestry"
+    assert [span.bbox for span in line.spans] == [(72, 71, 265, 83), (265, 69, 268, 84)]
+
+
+def test_merge_split_spans_keeps_spans_apart():
+    spans = [
+        dict(text="Genetic", font="Calibri", size=12, bbox=(72, 71, 110, 83)),
+        dict(text="\u019fssues", font="Calibri-Bold", size=12, bbox=(110, 71, 140, 83)),
+        dict(text="\u019fme", font="Calibri-Bold", size=12, bbox=(150, 71, 170, 83)),
+    ]
+    assert merge_split_spans(spans) == spans
+
+
+def test_soft_hyphen_ending_line_joins_broken_word():
+    content = TextBuilder("into population histo\xad ")
+    assert ends_with_dash(content)
+    content.chop()
+    content.append("ry and genomic discoveries ")
+    assert finalize_record(dict(content=content)) == dict(
+        content="into population history and genomic discoveries"
+    )
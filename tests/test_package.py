@@ -0,0 +1,49 @@
+import sys
+import inspect
+import importlib
+import subprocess
+import pytest
+import src
+from src import parsers
+
+
+@pytest.mark.parametrize(
+    "package, module_names",
+    [(src, src.SUBMODULES), (parsers, parsers.PARSER_MODULES)],
+    ids=["src", "parsers"],
+)
+def test_registries_list_the_functions_and_classes_of_the_modules(
+    package, module_names
+):
+    for module_name, names in module_names.items():
+        module = importlib.import_module(f"{package.__name__}.{module_name}")
+        assert all(hasattr(module, name) for name in names)
+        defined = {
+            name
+            for name, value in vars(module).items()
+            if not name.startswith("_")
+            and (inspect.isfunction(value) or inspect.isclass(value))
+            and value.__module__ == module.__name__
+        }
+        assert defined <= set(names), module_name
+
+
+def test_import_loads_submodules_on_first_use():
+    code = (
+        "import sys, src\n"
+        "loaded = lambda: sorted(m for m in sys.modules if m.startswith(('src', 'numpy', 'pandas', 'fitz')))\n"
+        "print(loaded())\n"
+        "src.get_parser_spec('2019', False).parse_page\n"
+        "print(loaded())\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    on_import, on_parse = map(eval, result.stdout.splitlines())
+    assert on_import == ["src", "src.parsers"]
+    assert "src.parsers.parser_19" in on_parse
+    assert not any(
+        name.startswith("src.parsers.parser_") and name != "src.parsers.parser_19"
+        for name in on_parse
+    )
+    assert "pandas" not in on_parse and "fitz" not in on_parse
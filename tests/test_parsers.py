@@ -0,0 +1,87 @@
+import os
+import pytest
+from src import (
+    plan_work_units,
+    get_parser_spec,
+    open_layout,
+    get_unit_pages,
+    iter_records,
+    split_pages,
+    parse_shard,
+    stitch_shards,
+    finalize_record,
+    records_to_frame,
+    finish_frame,
+)
+
+# Define directory paths
+DATA_FOLDER_PATH = os.path.join(os.path.dirname(__file__), "..", "data")
+PDF_FOLDER_PATH = os.path.join(DATA_FOLDER_PATH, "pdf")
+CSV_FOLDER_PATH = os.path.join(DATA_FOLDER_PATH, "csv")
+LAYOUT_FOLDER_PATH = os.path.join(DATA_FOLDER_PATH, "layout")
+
+# The work units of the PDF files in the repository, one per committed CSV file. The CSV files are the reviewed
+# output of the parsers: they are only updated by the changes that intentionally alter the parsed records, never
+# regenerated to make this test pass
+UNITS = [
+    unit
+    for filename in sorted(os.listdir(PDF_FOLDER_PATH))
+    if filename.endswith("pdf")
+    for unit in plan_work_units(filename)
+]
+
+
+def read_csv_text(unit):
+    """
+    Returns the text of the committed CSV file of a work unit, which pins the parsed records.
+    """
+    csv_path = os.path.join(CSV_FOLDER_PATH, f"{unit.name}.csv")
+    if not os.path.exists(csv_path):
+        pytest.skip(f"{csv_path} is not committed")
+    with open(csv_path, encoding="utf-8", newline="") as f:
+        return f.read()
+
+
+def to_csv_text(df):
+    """
+    Returns the text of a DataFrame as processor.py saves it.
+    """
+    return df.to_csv(index=False, escapechar="\\")
+
+
+@pytest.mark.parametrize("unit", UNITS, ids=lambda unit: unit.name)
+def test_parser_output_matches_committed_csv(unit):
+    expected = read_csv_text(unit)
+    spec = get_parser_spec(unit.year, unit.poster)
+    document = open_layout(
+        os.path.join(PDF_FOLDER_PATH, unit.filename), LAYOUT_FOLDER_PATH
+    )
+    pages = get_unit_pages(document, unit)
+    df = records_to_frame(
+        iter_records(document, pages, spec.read_page, spec.parse_page, spec.new_state())
+    )
+    assert to_csv_text(finish_frame(df, spec, unit.year)).splitlines() == (
+        expected.splitlines()
+    )
+
+
+@pytest.mark.parametrize(
+    "unit",
+    [unit for unit in UNITS if get_parser_spec(unit.year, unit.poster).shardable],
+    ids=lambda unit: unit.name,
+)
+def test_sharded_parser_output_matches_committed_csv(unit):
+    expected = read_csv_text(unit)
+    spec = get_parser_spec(unit.year, unit.poster)
+    document = open_layout(
+        os.path.join(PDF_FOLDER_PATH, unit.filename), LAYOUT_FOLDER_PATH
+    )
+    shards = [
+        parse_shard(document, shard, spec.read_page, spec.parse_page)
+        for shard in split_pages(get_unit_pages(document, unit), 7)
+    ]
+    state = stitch_shards(shards, spec.parse_page)
+    df = records_to_frame(map(finalize_record, state["data"]))
+    assert to_csv_text(finish_frame(df, spec, unit.year)).splitlines() == (
+        expected.splitlines()
+    )
@@ -0,0 +1,100 @@
+from collections import defaultdict
+import pytest
+from src.layout import Line, Span
+from src.utils import (
+    TextBuilder,
+    assemble_lines,
+    finalize_record,
+    iter_records,
+    parse_shard,
+    split_pages,
+    stitch_shards,
+)
+
+# Pages of a toy document, where "#" starts an entry and "!" makes the parser fail after the lines before it
+PAGES = [
+    ["#1", "a"],
+    ["b", "#2", "c"],
+    ["d", "!", "e"],
+    ["f", "#3", "g"],
+    ["h", "!"],
+    ["#4", "i", "!"],
+    ["j"],
+]
+
+
+def parse_page(state, lines):
+    for line in lines:
+        if line == "!":
+            raise ValueError("malformed line")
+        if line.startswith("#"):
+            state["data"].append(defaultdict(TextBuilder, id=TextBuilder(line[1:])))
+        else:
+            state["data"][-1]["content"].append(line + " ")
+
+
+@pytest.fixture
+def quarantined():
+    return []
+
+
+@pytest.fixture
+def on_error(quarantined):
+    return lambda page_num, error: quarantined.append(page_num)
+
+
+def test_iter_records_quarantines_failing_pages(on_error, quarantined):
+    records = list(iter_records(PAGES, None, list, parse_page, on_error=on_error))
+    assert records == [
+        dict(id="1", content="a b"),
+        dict(id="2", content="c d f"),
+        dict(id="3", content="g h"),
+        dict(id="4", content="i j"),
+    ]
+    assert quarantined == [2, 4, 5]
+
+
+@pytest.mark.parametrize("shard_pages", [1, 2, 3])
+def test_sharded_parsing_quarantines_like_iter_records(
+    shard_pages, on_error, quarantined
+):
+    expected = list(
+        iter_records(PAGES, None, list, parse_page, on_error=lambda *_: None)
+    )
+    shards = [
+        parse_shard(PAGES, shard, list, parse_page, on_error)
+        for shard in split_pages(list(range(len(PAGES))), shard_pages)
+    ]
+    state = stitch_shards(shards, parse_page)
+    assert list(map(finalize_record, state["data"])) == expected
+    assert quarantined == [2, 4, 5]
+
+
+def test_stitch_shards_raises_on_pages_not_quarantined():
+    shards = [parse_shard(PAGES, [0, 1], list, parse_page)]
+    shards.append(dict(head=[(2, PAGES[2])], data=[], quarantined=[]))
+    with pytest.raises(ValueError):
+        stitch_shards(shards, parse_page)
+
+
+def make_line(text, x0, y0):
+    return Line(
+        [Span(text, "Arial", 9, (x0, y0, x0 + 40, y0 + 9))], [x0, y0, x0 + 40, y0 + 9]
+    )
+
+
+def test_assemble_lines_keeps_extraction_order():
+    lines = [make_line("b", 0, 20), make_line("a", 0, 0), make_line("c", 50, 21)]
+    assert [line.text for line in assemble_lines(lines)] == ["b", "a", "c"]
+
+
+def test_assemble_lines_sorts_lines_out_of_order():
+    lines = [
+        make_line("c", 50, 21),
+        make_line("a", 0, 0),
+        make_line("d", 0, 40),
+        make_line("b", 0, 20),
+    ]
+    rebuilt = assemble_lines(lines, sort=True)
+    assert [line.text for line in rebuilt] == ["a", "b c", "d"]
+    assert rebuilt[1].bbox == [0, 20, 90, 29]